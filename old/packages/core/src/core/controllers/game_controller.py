@@ -1,3 +1,4 @@
+import base64
 import json
 from typing import List
 
@@ -8,26 +9,155 @@ from aws_lambda_powertools.event_handler.exceptions import (
     NotFoundError,
     BadRequestError,
 )
+from botocore.exceptions import BotoCoreError
+from pydantic import ValidationError
 
+from core.realtime import RealtimeEvent, publish_iot
 from core.tables import LobbyTable, GameTable
+import core.utils.dynamo as Dynamo
 import engine
+from engine.roles import Actor
+
+logger = Logger()
+
+
+def encode_snapshot(engine_game: engine.Game) -> str:
+    """Engine snapshots are binary, they're stored as base64 text"""
+    return base64.b64encode(engine_game.snapshot()).decode()
+
+
+def game_actor(game_id: str, actor: Actor) -> GameTable.Entities.GameActor:
+    return GameTable.Entities.GameActor(
+        id=actor.player.id,
+        gameId=game_id,
+        createdAt=Dynamo.timestamp(),
+        role=actor.role_name,
+        state=json.dumps(actor.dump_state()),
+    )
 
 
 def create_game_from_lobby(
     lobby: LobbyTable.Entities.Lobby, users: List[LobbyTable.Entities.LobbyUser]
-) -> None:
+) -> GameTable.Entities.Game:
     players = [
-        {
-            "id": user.id,
-            "name": user.username,
-            "alias": user.username,
-        }
+        engine.Player(id=user.id, name=user.username, alias=user.username)
         for user in users
     ]
 
     engine_game = engine.new_game(players, lobby.config)
     ddb_game = GameTable.Entities.Game(
         id=lobby.id,
-        config=json.dumps(lobby.config.dict()),
-        state=json.dumps(engine_game.dump_state()),
+        createdAt=Dynamo.timestamp(),
+        config=engine_game.config.model_dump_json(),
+        snapshot=encode_snapshot(engine_game),
     )
+
+    try:
+        GameTable.table.put_item(Item=ddb_game.serialize())
+        with GameTable.table.batch_writer() as batch:
+            for actor in engine_game.actors:
+                batch.put_item(Item=game_actor(ddb_game.id, actor).serialize())
+    except BotoCoreError as e:
+        logger.error(f"Error in DynamoDB operation: {e}")
+        raise InternalServerError(f"Error in DynamoDB operation: {e}")
+
+    return ddb_game
+
+
+def get_game_by_id(game_id: str) -> GameTable.Entities.Game:
+    try:
+        item = GameTable.table.get_item(Key={"PK": game_id, "SK": "A"}).get("Item")
+    except BotoCoreError as e:
+        logger.error(f"Error in DynamoDB operation: {e}")
+        raise InternalServerError(f"Error in DynamoDB operation: {e}")
+
+    if not item:
+        raise NotFoundError(f"No game with id '{game_id}'")
+
+    try:
+        return GameTable.Entities.Game.deserialize(item)
+    except ValidationError as e:
+        logger.error(str(e))
+        raise InternalServerError(str(e))
+
+
+def get_game_actors(game_id: str) -> List[GameTable.Entities.GameActor]:
+    try:
+        items = GameTable.table.query(
+            KeyConditionExpression="#pk=:pk and begins_with(#sk, :sk)",
+            ExpressionAttributeNames={"#pk": "PK", "#sk": "SK"},
+            ExpressionAttributeValues={":pk": game_id, ":sk": "GA#"},
+        ).get("Items", [])
+    except BotoCoreError as e:
+        logger.error(str(e))
+        raise InternalServerError(f"Error in DynamoDB operation: {e}")
+
+    try:
+        return [GameTable.Entities.GameActor.deserialize(item) for item in items]
+    except ValidationError as e:
+        logger.error(str(e))
+        raise InternalServerError(str(e))
+
+
+def load_engine_game(game: GameTable.Entities.Game) -> engine.Game:
+    if not game.snapshot and not game.state:
+        raise BadRequestError(f"Game '{game.id}' has no snapshot or state to load")
+
+    try:
+        if game.snapshot:
+            return engine.load_snapshot(base64.b64decode(game.snapshot), game.config)
+
+        # Older items, the JSON state and an actor row per player. The next
+        # save_engine_game stores a snapshot for them
+        actors = [json.loads(actor.state) for actor in get_game_actors(game.id)]
+        actors.sort(key=lambda actor: actor["number"])
+        return engine.load_game(actors, game.config, json.loads(game.state))
+    except ValueError as e:
+        logger.error(str(e))
+        raise InternalServerError(str(e))
+
+
+def save_engine_game(game: GameTable.Entities.Game, engine_game: engine.Game) -> None:
+    update = game.update({"snapshot": encode_snapshot(engine_game)})
+    try:
+        GameTable.table.update_item(
+            Key={"PK": game.PK, "SK": game.SK},
+            UpdateExpression=update.expression,
+            ExpressionAttributeNames=update.names,
+            ExpressionAttributeValues=update.values,
+        )
+    except BotoCoreError as e:
+        logger.error(f"Error in DynamoDB operation: {e}")
+        raise InternalServerError(f"Error in DynamoDB operation: {e}")
+
+
+def save_game_changes(
+    game: GameTable.Entities.Game,
+    engine_game: engine.Game,
+    changes: engine.ChangeSet,
+) -> None:
+    """Persist a resolve or lynch, rewriting only the actors that changed"""
+    save_engine_game(game, engine_game)
+
+    try:
+        with GameTable.table.batch_writer() as batch:
+            for number in changes.numbers:
+                actor = engine_game.get_actor_by_number(number)
+                batch.put_item(Item=game_actor(game.id, actor).serialize())
+    except BotoCoreError as e:
+        logger.error(f"Error in DynamoDB operation: {e}")
+        raise InternalServerError(f"Error in DynamoDB operation: {e}")
+
+
+def publish_game_changes(
+    game_id: str, engine_game: engine.Game, changes: engine.ChangeSet
+) -> None:
+    """
+    Push the delta of a resolve or lynch. Deaths and the graveyard go to
+    everyone in the game, each player's own targets, role actions and allies
+    only to their player topic
+    """
+    publish_iot(game_id, RealtimeEvent.GAME_UPDATE, changes.dump_public())
+    for number, private in changes.dump_private().items():
+        player = engine_game.get_actor_by_number(number).player
+        publish_iot(f"{game_id}/{player.id}", RealtimeEvent.GAME_UPDATE, private)
@@ -339,12 +339,9 @@ def promote_lobby_user_to_host(
 
     # Update the Lobby
     try:
+        # Plain values, DynamoDB can't serialise the LobbyHost model itself
         operation = lobby.update(
-            {
-                "host": LobbyTable.Entities.Lobby.LobbyHost(
-                    id=lobby_user.id, username=lobby_user.username
-                )
-            }
+            {"host": {"id": lobby_user.id, "username": lobby_user.username}}
         )
 
         LobbyTable.table.update_item(
@@ -19,7 +19,7 @@ class RealtimeEvent(Enum):
     LOBBY_NEW_HOST = "lobby.new-host"
 
     # Game Events
-    # TODO: Add game events
+    GAME_UPDATE = "game.update"
 
 
 def publish_iot(
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from enum import Enum
+from typing import Optional
 
 import boto3
 from core.utils.dynamo import CompositeEntity
@@ -30,7 +31,9 @@ class Entities:
     class Game(BaseEntity):
         type: EntityType = EntityType.GAME
         config: str
-        state: str
+        # Older items carry the JSON state, newer ones a base64 engine snapshot
+        state: Optional[str] = None
+        snapshot: Optional[str] = None
 
         @property
         def PK(self) -> str:
@@ -0,0 +1,54 @@
+"""
+Reports the memory a warm 15 player game holds, in bytes per game, measured
+with tracemalloc over a batch of games that have each played a night. The
+Player models are made before measuring, only what the engine builds on top
+of them counts.
+"""
+
+import gc
+import random
+import tracemalloc
+
+from engine.models import Game, compile_config
+from engine.simulation import headless, random_targets
+
+from _ import dummy_config, dummy_players
+
+ROLES = ["Citizen", "Doctor", "Bodyguard", "Godfather", "Mafioso"]
+GAMES = 1000
+PLAYERS = 15
+
+
+def play_night(game: Game, rng: random.Random) -> None:
+    game.generate_allies_and_possible_targets()
+    for actor in game.alive_actors:
+        actor.set_targets(random_targets(actor, game, rng))
+    game.resolve()
+
+
+def measure(recording: bool) -> float:
+    config = compile_config(dummy_config(roles=ROLES))
+    rng = random.Random(0)
+    players = [dummy_players(PLAYERS) for _ in range(GAMES)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    with headless():
+        games = []
+        for seed in range(GAMES):
+            game = Game.new(players[seed], config, seed=seed)
+            game.collector.recording = recording
+            play_night(game, rng)
+            games.append(game)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return (after - before) / GAMES
+
+
+if __name__ == "__main__":
+    for recording in (False, True):
+        label = "with events" if recording else "headless"
+        print(f"{PLAYERS} players, {label:<12} {measure(recording):>10,.0f} bytes/game")
@@ -0,0 +1,58 @@
+"""
+Compares nights per second on the object engine and the NumPy kernel, then
+cross-checks the kernel's outcomes against the engine's. Needs engine[simulation].
+"""
+
+import json
+import random
+import time
+
+import numpy as np
+
+from engine.models import Game
+from engine.simulation import headless, random_targets
+from engine.simulation.cross_check import cross_check
+from engine.simulation.kernel import NightBatch
+from engine.simulation.simulator import simulated_players
+
+from _ import dummy_config
+
+ROLES = ["Citizen", "Doctor", "Bodyguard", "Godfather", "Mafioso"]
+GAMES = 2000
+NIGHTS = 3
+
+
+def benchmark():
+    config = dummy_config(roles=ROLES)
+    with headless():
+        games = [Game.new(simulated_players(15), config, seed=i) for i in range(GAMES)]
+        for game in games:
+            game.collector.recording = False
+        batch = NightBatch.from_games(games)
+
+        start = time.perf_counter()
+        rng = random.Random(0)
+        for game in games:
+            for _ in range(NIGHTS):
+                game.generate_allies_and_possible_targets()
+                for actor in game.alive_actors:
+                    actor.set_targets(random_targets(actor, game, rng))
+                game.resolve()
+        engine_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(0)
+    for _ in range(NIGHTS):
+        batch.resolve(batch.random_targets(rng), rng)
+    kernel_seconds = time.perf_counter() - start
+
+    nights = GAMES * NIGHTS
+    print(f"engine {nights / engine_seconds:>12,.0f} nights/s")
+    print(f"kernel {nights / kernel_seconds:>12,.0f} nights/s")
+
+    report = cross_check(config, games=GAMES, nights=NIGHTS)
+    print(json.dumps(report.dump(), indent=2))
+
+
+if __name__ == "__main__":
+    benchmark()
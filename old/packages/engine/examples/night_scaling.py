@@ -0,0 +1,76 @@
+"""
+Times a night at 15, 100 and 1000 players. The cost per player should stay
+roughly flat as games grow.
+"""
+
+import random
+import time
+
+import engine
+from engine.utils.bitset import numbers_of
+
+from _ import dummy_players
+
+SIZES = [15, 100, 1000]
+ROUNDS = 5
+
+
+def scaled_config(players: int) -> dict:
+    # Roughly a tenth of the game in each active role, the rest Citizens
+    share = max(1, players // 10)
+    return {
+        "tags": [
+            *["town_protective"] * (2 * share),
+            *["mafia_killing"] * share,
+            "any_random",
+        ],
+        "settings": {"maxPlayers": max(players, 15)},
+        "roles": {
+            "Citizen": {"max": 0, "weight": 0.01, "settings": {"maxVests": 2}},
+            "Doctor": {"max": share, "weight": 1, "settings": {}},
+            "Bodyguard": {"max": share, "weight": 1, "settings": {}},
+            "Mafioso": {"max": share, "weight": 1, "settings": {}},
+            "Godfather": {"max": 1, "weight": 1, "settings": {}},
+        },
+    }
+
+
+def night(players: int, rng: random.Random) -> dict:
+    config = engine.compile_config(scaled_config(players))
+
+    start = time.perf_counter()
+    game = engine.new_game(dummy_players(players), config, seed=rng.randrange(2**31))
+    created = time.perf_counter() - start
+
+    for actor in game.actors:
+        if actor.possible_targets and actor.possible_targets[0]:
+            number = rng.choice(numbers_of(actor.possible_targets[0]))
+            actor.set_targets([game.get_actor_by_number(number)])
+    actors, state = game.dump_actors(), game.dump_state()
+
+    start = time.perf_counter()
+    game = engine.Game.load(actors, config, state, trusted=True)
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    game.resolve()
+    resolved = time.perf_counter() - start
+
+    return {"new": created, "load": loaded, "resolve": resolved}
+
+
+def benchmark():
+    rng = random.Random(0)
+    print(f"{'players':>8} {'new':>10} {'load':>10} {'resolve':>10} {'per player':>12}")
+    for players in SIZES:
+        runs = [night(players, rng) for _ in range(ROUNDS)]
+        best = {key: min(run[key] for run in runs) for key in runs[0]}
+        total = best["load"] + best["resolve"]
+        print(
+            f"{players:>8} {best['new'] * 1e3:>8.2f}ms {best['load'] * 1e3:>8.2f}ms "
+            f"{best['resolve'] * 1e3:>8.2f}ms {total / players * 1e6:>10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
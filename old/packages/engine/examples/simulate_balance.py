@@ -0,0 +1,17 @@
+import json
+
+from engine.simulation import simulate
+
+from _ import dummy_config
+
+
+def balance():
+    config = dummy_config(roles=["Citizen", "Doctor", "Bodyguard", "Mafioso"])
+
+    report = simulate(config, games=10_000, seed=0)
+
+    print(json.dumps(report.dump(), indent=2))
+
+
+if __name__ == "__main__":
+    balance()
@@ -1,20 +1,131 @@
-from typing import List
+import logging
+from concurrent.futures import Executor
+from functools import partial
+from typing import List, Optional, Sequence, Tuple
 
-from pydantic import BaseModel, ValidationError
+from engine.models import Game, GameConfig, GameState, Player, compile_config
+from engine.models.change_set import ChangeSet  # noqa: F401
+from engine.models.compiled_config import ConfigInput
+from engine.models.day import Day, Phase, Verdict  # noqa: F401
+from engine.models.resolve_result import ResolveResult
+from engine.snapshot import dump_snapshot, load_snapshot  # noqa: F401
+from engine.templates import catalogue  # noqa: F401
+from engine.utils import process_map
+from engine.utils.logging import collect_logs, logger
+from engine.utils.timer import Timer
 
-from engine.models import Game, GameConfig, GameState, Player
-from engine.utils.logging import logger
+GameInput = Tuple[List[Player], ConfigInput, GameState]
 
 
-def new_game(players: List[Player], config: GameConfig, tries=1) -> Game:
-    for i in range(tries):
-        try:
-            game = Game.new(players, config)
-            return game
-        except ValidationError as e:
-            logger.error(f"Failed to create a new game: {e}")
-            continue  # TODO: This is a temporary solution, we should handle this better
+def new_game(
+    players: List[Player], config: ConfigInput, seed: int = None, strict=False
+) -> Game:
+    """
+    Create a new game. Tags that the config can never fill fall back to
+    Citizen, unless :strict is set in which case a ValueError is raised
+    before any roles are rolled.
+    """
+    config = compile_config(config)
+    unfillable = config.solver.unfillable
+    if unfillable:
+        if strict:
+            raise ValueError(f"Config cannot fill tags: {unfillable}")
+        logger.warning("Config cannot fill tags: %s", unfillable)
 
+    return Game.new(players, config, seed)
 
-def load_game(players: List[Player], config: GameConfig, state: GameState) -> Game:
-    return Game.load(players, config, state)
+
+def load_game(
+    players: List[Player], config: ConfigInput, state: GameState, trusted=False
+) -> Game:
+    """
+    Load a stored game. Pass :trusted only for players and state the engine
+    dumped itself, they are then used without being validated again.
+    """
+    return Game.load(players, config, state, trusted=trusted)
+
+
+def resolve(
+    players: List[Player],
+    config: ConfigInput,
+    state: GameState,
+    log_level: int = logging.INFO,
+    trusted: bool = False,
+) -> ResolveResult:
+    """
+    Load a game, resolve the night and check for a winner, then dump it all
+    in one pass. Each stage is timed in the result's metrics.
+
+    The engine's log for the resolve is kept in the result, collected at
+    :log_level and above. :trusted is passed through to load_game.
+    """
+    timer = Timer()
+    with collect_logs(log_level) as log:
+        with timer("load"):
+            game = load_game(players, config, state, trusted=trusted)
+        with timer("resolve"):
+            changes = game.resolve()
+        with timer("checkForWin"):
+            winners = game.check_for_win()
+
+    with timer("dump"):
+        state, actors = game.dump()
+        timeline = game.events.timeline()
+        log = log.dump()
+
+    return ResolveResult(
+        state=state,
+        actors=actors,
+        timeline=timeline,
+        duration=game.events.duration,
+        changes=changes,
+        winners=[winner.number for winner in winners] if winners else None,
+        log=log,
+        metrics={
+            **timer.dump(),
+            "actors": len(actors),
+            "events": len(timeline),
+        },
+    )
+
+
+def resolve_game(
+    players: List[Player],
+    config: ConfigInput,
+    state: GameState,
+    log_level: int = logging.INFO,
+    trusted: bool = False,
+) -> dict:
+    """
+    Load a game, resolve the night and return everything a caller needs to persist.
+
+    The dump of engine.resolve without its metrics, so the result only depends
+    on the game.
+    """
+    return resolve(players, config, state, log_level, trusted).dump(metrics=False)
+
+
+def _resolve_game(game: GameInput, trusted: bool = False) -> dict:
+    # Module level so it can be pickled across to the pool workers
+    return resolve_game(*game, trusted=trusted)
+
+
+def resolve_many(
+    games: Sequence[GameInput],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    trusted: bool = False,
+) -> List[dict]:
+    """
+    Resolve a batch of games, each given as a (players, config, state) tuple.
+
+    Games are spread over a process pool (or the provided executor) and the
+    results are returned in the same order as the input. Each result matches
+    what resolve_game returns for that game on its own, provided the states
+    carry a seed.
+    """
+    resolve = partial(_resolve_game, trusted=trusted)
+    if executor is not None:
+        return list(executor.map(resolve, games))
+
+    return process_map(resolve, games, max_workers=max_workers)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-from typing import List, Union
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+import engine.templates as templates
+
+BROADCAST = "*"
 
 
 @dataclass
@@ -14,19 +18,38 @@ class Duration:
     # Neutral Actions
 
 
-@dataclass
+@dataclass(slots=True)
 class GameEvent:
-    """What event was it, and who should it be broadcast to"""
+    """
+    What event was it, and who should it be broadcast to.
+
+    The text isn't carried, only the id of its template in engine.templates
+    and the parameters to fill it in with. Events without a template are
+    silent.
+    """
 
     event_id: str
     targets: list
-    message: str
-
-    def dump(self) -> dict:
-        return asdict(self)
+    template: Optional[str] = None
+    params: Optional[dict] = None
 
+    @property
+    def message(self) -> str:
+        return templates.render(self.template, self.params)
 
-@dataclass
+    def dump(self) -> dict:
+        dump = {
+            "event_id": self.event_id,
+            "targets": list(self.targets),
+            "template": self.template,
+        }
+        # Most templates take no parameters, leave the key out rather than ship nulls
+        if self.params:
+            dump["params"] = self.params
+        return dump
+
+
+@dataclass(slots=True)
 class GameEventGroup:
     """A Grouping of game events, eg. Broadcast event A to all players, and event B to select players"""
 
@@ -57,13 +80,95 @@ class GameEventGroup:
             elif isinstance(event, GameEvent) and event.event_id == id:
                 return event
 
-    def dump(self) -> dict:
-        return asdict(self)["events"]
+    def dump(self) -> List[dict]:
+        return self.dump_indexed()[0]
+
+    def timeline(self) -> List[dict]:
+        return self.dump_playback()[1]
+
+    def dump_indexed(self) -> Tuple[List[dict], Dict[str, List[dict]]]:
+        """
+        Dump the tree along with an index of recipient -> their events in order.
+
+        Events sent to everyone go in the BROADCAST bucket rather than every
+        recipient's list. Index entries are timeline entries, see dump_playback.
+        """
+        tree, timeline = self.dump_playback()
+        return tree, index_by_recipient(timeline)
+
+    def dump_playback(self, start: int = 0) -> Tuple[List[dict], List[dict]]:
+        """
+        Dump the tree along with its timeline, in a single walk of the tree.
+
+        The timeline is every event in play order with its absolute "offset"
+        (seconds from the start of the night). Events play as soon as they're
+        reached, a group plays its contents in order and then holds for the
+        rest of its duration, so the next group starts once it has finished.
+        """
+        timeline: List[dict] = []
+
+        def walk(group: GameEventGroup, offset: int) -> List[dict]:
+            dumped = []
+            for event in group.events:
+                if isinstance(event, GameEventGroup):
+                    dumped.append(
+                        {
+                            "group_id": event.group_id,
+                            "duration": event.duration,
+                            "events": walk(event, offset),
+                        }
+                    )
+                    offset += event.duration
+                    continue
+
+                event = event.dump()
+                dumped.append(event)
+                timeline.append({"offset": offset, "group_id": group.group_id, **event})
+            return dumped
+
+        return walk(self, start), timeline
+
+
+def index_by_recipient(timeline: List[dict]) -> Dict[str, List[dict]]:
+    index: Dict[str, List[dict]] = {}
+    for entry in timeline:
+        for recipient in entry["targets"]:
+            index.setdefault(recipient, []).append(entry)
+    return index
+
+
+class EventCollector:
+    """Collects the events raised by actors while a single Game resolves.
+
+    Owned by the Game and handed to each of its actors. Every action gets its own
+    group which is only attached to the root once the action has finished.
+    With recording off, roles skip building their events altogether
+    """
+
+    __slots__ = ("root", "action", "recording")
+
+    def __init__(self, root: GameEventGroup = None, recording: bool = True):
+        self.root = root if root is not None else GameEventGroup(group_id="root")
+        self.action = GameEventGroup(group_id="action")
+        self.recording = recording
+
+    def start_action(self, group_id: str) -> GameEventGroup:
+        return self.action.reset(group_id)
+
+    def end_action(self) -> None:
+        # An empty action's group is reset and reused for the next one, only
+        # groups that made it into the tree need replacing
+        if self.action.events:
+            self.root.new_event_group(self.action)
+            self.action = GameEventGroup(group_id="action")
+        else:
+            self.action.reset("action")
 
+    def new_event(self, event: GameEvent):
+        self.action.new_event(event)
 
-# Create a root event group. Bit silly but I want to use the methods
-# EVENTS = GameEventGroup(group_id='root')
-ACTION_EVENTS = GameEventGroup(group_id="action")
+    def new_event_group(self, event_group: GameEventGroup):
+        self.action.new_event_group(event_group)
 
 
 # ------- Shared Events ------- #
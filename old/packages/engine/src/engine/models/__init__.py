@@ -1,4 +1,5 @@
 from engine.models.player import Player  # noqa: F401
 from engine.models.game_state import GameState  # noqa: F401
 from engine.models.game_config import GameConfig  # noqa: F401
+from engine.models.compiled_config import CompiledConfig, compile_config  # noqa: F401
 from engine.models.game import Game  # noqa: F401
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from engine.roles import Actor
+
+
+class ActorIndex:
+    """Lookups over a Game's actors, kept up to date as actors live and die.
+
+    Actors bound to an index report their own alive changes (see Actor.alive),
+    so none of the views need rebuilding by scanning every actor. The alive and
+    alignment masks are bitsets of player numbers (see engine.utils.bitset), and
+    living actors are counted per alignment and per role so win conditions
+    never have to scan the actors.
+    :on_death is called with each actor the moment they go from alive to dead
+    """
+
+    def __init__(self, actors: Iterable[Actor] = ()):
+        self.by_number: Dict[int, Actor] = {}
+        self.by_alignment: Dict[object, List[Actor]] = {}
+        self._alignment_tuples: Dict[object, Tuple[Actor, ...]] = {}
+        self.alignment_masks: Dict[object, int] = {}
+        self.alive: Dict[int, Actor] = {}
+        self.dead: Dict[int, Actor] = {}
+        self.alive_mask = 0
+        self.alive_alignments: Counter = Counter()
+        self.alive_roles: Counter = Counter()
+        self._alive_tuple: Optional[Tuple[Actor, ...]] = None
+        self._dead_tuple: Optional[Tuple[Actor, ...]] = None
+        self.on_death: Optional[Callable[[Actor], None]] = None
+
+        for actor in actors:
+            self.add(actor)
+
+    @classmethod
+    def of(cls, actors: ActorIndex | Iterable[Actor]) -> ActorIndex:
+        """Use :actors as is if it's already an index, otherwise index them"""
+        return actors if isinstance(actors, ActorIndex) else cls(actors)
+
+    def add(self, actor: Actor) -> None:
+        self.by_number[actor.number] = actor
+        self.by_alignment.setdefault(actor.alignment, []).append(actor)
+        self._alignment_tuples.pop(actor.alignment, None)
+        self.alignment_masks[actor.alignment] = (
+            self.alignment_masks.get(actor.alignment, 0) | actor.bit
+        )
+        if actor.alive:
+            self._count(actor, 1)
+        self._file(actor)
+
+    def get(self, number: int) -> Optional[Actor]:
+        return self.by_number.get(number)
+
+    def alignment(self, alignment) -> Tuple[Actor, ...]:
+        """
+        Every actor of :alignment, dead or alive. The same tuple is handed
+        to every caller until another actor is added
+        """
+        if alignment not in self._alignment_tuples:
+            self._alignment_tuples[alignment] = tuple(
+                self.by_alignment.get(alignment, ())
+            )
+        return self._alignment_tuples[alignment]
+
+    def alignment_mask(self, alignment) -> int:
+        return self.alignment_masks.get(alignment, 0)
+
+    def alive_count(self, alignment=None) -> int:
+        """Living actors of :alignment, or all of them"""
+        if alignment is None:
+            return len(self.alive)
+        return self.alive_alignments[alignment]
+
+    def alive_role_count(self, role: str) -> int:
+        return self.alive_roles[role]
+
+    def update(self, actor: Actor) -> None:
+        """Move an actor between the alive and dead views"""
+        if actor.number in (self.alive if actor.alive else self.dead):
+            return
+        self.alive.pop(actor.number, None)
+        self.dead.pop(actor.number, None)
+        self._count(actor, 1 if actor.alive else -1)
+        self._file(actor)
+        if not actor.alive and self.on_death is not None:
+            self.on_death(actor)
+
+    def _count(self, actor: Actor, delta: int) -> None:
+        self.alive_alignments[actor.alignment] += delta
+        self.alive_roles[actor.role_name] += delta
+
+    def _file(self, actor: Actor) -> None:
+        if actor.alive:
+            self.alive[actor.number] = actor
+            self.alive_mask |= actor.bit
+        else:
+            self.dead[actor.number] = actor
+            self.alive_mask &= ~actor.bit
+        self._alive_tuple = None
+        self._dead_tuple = None
+
+    @property
+    def alive_actors(self) -> Tuple[Actor, ...]:
+        """Cached until the next death, a tuple so callers can't edit the cache"""
+        if self._alive_tuple is None:
+            self._alive_tuple = tuple(self.alive.values())
+        return self._alive_tuple
+
+    @property
+    def dead_actors(self) -> Tuple[Actor, ...]:
+        if self._dead_tuple is None:
+            self._dead_tuple = tuple(self.dead.values())
+        return self._dead_tuple
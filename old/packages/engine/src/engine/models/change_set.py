@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from engine.utils.bitset import numbers_of
+
+if TYPE_CHECKING:
+    from engine.roles import Actor
+
+# alive, target numbers, role actions, possible target masks. Allies only
+# change when one of them dies, which the alive flags already cover
+Fingerprint = Tuple[bool, Tuple[int, ...], dict, Tuple[int, ...]]
+
+
+def fingerprint(actor: Actor) -> Fingerprint:
+    return (
+        actor.alive,
+        tuple(target.number for target in actor.targets),
+        actor.dump_role_actions(),
+        tuple(actor.possible_targets),
+    )
+
+
+@dataclass
+class ActorChange:
+    """Only the fields of an actor that changed are set"""
+
+    number: int
+    alive: Optional[bool] = None
+    targets: Optional[List[int]] = None
+    role_actions: Optional[dict] = None
+    allies: Optional[List[dict]] = None
+    possible_targets: Optional[List[List[int]]] = None
+
+    def dump(self) -> dict:
+        return {**self.dump_public(), **self.dump_private()}
+
+    def dump_public(self) -> dict:
+        """What everyone in the game may see, whether the actor died"""
+        if self.alive is None:
+            return {"number": self.number}
+        return {"number": self.number, "alive": self.alive}
+
+    def dump_private(self) -> dict:
+        """What only the actor's own player may see"""
+        fields = {
+            "targets": self.targets,
+            "roleActions": self.role_actions,
+            "allies": self.allies,
+            "possibleTargets": self.possible_targets,
+        }
+        return {
+            "number": self.number,
+            **{key: value for key, value in fields.items() if value is not None},
+        }
+
+
+@dataclass
+class ChangeSet:
+    """What a resolve or lynch changed, so callers can persist and publish deltas"""
+
+    day: int
+    actors: Dict[int, ActorChange] = field(default_factory=dict)
+    graveyard: List[dict] = field(default_factory=list)
+
+    @classmethod
+    def diff(
+        cls,
+        day: int,
+        before: Dict[int, Fingerprint],
+        actors: List[Actor],
+        graveyard: List[dict] = (),
+    ) -> ChangeSet:
+        """:graveyard is the records added to the game's graveyard since :before"""
+        changes = cls(day, graveyard=list(graveyard))
+        actors = sorted(actors, key=lambda actor: actor.number)
+        now = {actor.number: fingerprint(actor) for actor in actors}
+
+        # Factions that lost (or regained) a member this time
+        moved = {
+            actor.alignment
+            for actor in actors
+            if before[actor.number][0] != now[actor.number][0]
+        }
+
+        allies: Dict[int, List[dict]] = {}
+        for actor in actors:
+            was, fingerprint_now = before[actor.number], now[actor.number]
+            allies_moved = bool(actor.allies) and actor.alignment in moved
+            if was == fingerprint_now and not allies_moved:
+                continue
+
+            change = ActorChange(actor.number)
+            if was[0] != fingerprint_now[0]:
+                change.alive = actor.alive
+            if was[1] != fingerprint_now[1]:
+                change.targets = list(fingerprint_now[1])
+            if was[2] != fingerprint_now[2]:
+                change.role_actions = fingerprint_now[2]
+            if was[3] != fingerprint_now[3]:
+                change.possible_targets = [
+                    numbers_of(mask) for mask in fingerprint_now[3]
+                ]
+            if allies_moved:
+                # Dumped once per faction, like Game.dump_actors
+                if id(actor.allies) not in allies:
+                    allies[id(actor.allies)] = actor.dump_allies()
+                change.allies = allies[id(actor.allies)]
+            changes.actors[actor.number] = change
+
+        return changes
+
+    def __bool__(self) -> bool:
+        return bool(self.actors)
+
+    @property
+    def numbers(self) -> List[int]:
+        return list(self.actors)
+
+    def dump(self) -> dict:
+        return {
+            "day": self.day,
+            "actors": [change.dump() for change in self.actors.values()],
+            "graveyard": self.graveyard,
+        }
+
+    def dump_public(self) -> dict:
+        """The deaths and graveyard only, safe to broadcast to the whole game"""
+        return {
+            "day": self.day,
+            "actors": [
+                change.dump_public()
+                for change in self.actors.values()
+                if change.alive is not None
+            ],
+            "graveyard": self.graveyard,
+        }
+
+    def dump_private(self) -> Dict[int, dict]:
+        """
+        Each actor's own targets, role actions, allies and possible targets
+        (as lists of player numbers) by number, for the
+        actors that have any. Shaped like dump_public so clients merge both
+        the same way.
+        """
+        private = {}
+        for number, change in self.actors.items():
+            dump = change.dump_private()
+            if len(dump) > 1:
+                private[number] = {"day": self.day, "actors": [dump]}
+        return private
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple, Union
+
+from pydantic import BaseModel
+
+from engine.models.game_config import GameConfig, GameSettings
+from engine.models.role_solver import FALLBACK_ROLE, RoleSolver
+from engine.roles import ROLE_SPECS, ROLES
+
+CACHE_SIZE = 128
+
+ConfigInput = Union["CompiledConfig", GameConfig, Mapping[str, Any], str, bytes]
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """
+    A validated GameConfig with everything a Game derives from it worked out once.
+
+    Compiled configs are shared between every game loaded with the same config,
+    so none of this should be mutated.
+    """
+
+    key: str
+    config: GameConfig
+    settings: GameSettings
+    # Role name -> parsed settings, for every implemented role the config uses
+    role_settings: Mapping[str, Any]
+    solver: RoleSolver
+    # Role names in the order they act at night, and their sort keys
+    turn_order: Tuple[str, ...]
+    turn_rank: Mapping[str, int]
+
+    def __reduce__(self):
+        # Ship the plain config to pool workers and compile it again over there
+        return compile_config, (self.config,)
+
+    @property
+    def player_context(self) -> dict:
+        """Validation context for this config's players, see engine.models.player"""
+        return {"max_players": self.settings.max_players}
+
+    @property
+    def tags(self):
+        return self.config.tags
+
+    @property
+    def roles(self):
+        return self.config.roles
+
+
+def config_key(config: ConfigInput) -> str:
+    """Hash of a config's content, used to key the compiled config cache"""
+    if isinstance(config, CompiledConfig):
+        return config.key
+    if isinstance(config, BaseModel):
+        config = config.model_dump(mode="json")
+    if not isinstance(config, (str, bytes)):
+        config = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    if isinstance(config, str):
+        config = config.encode()
+    return hashlib.sha256(config).hexdigest()
+
+
+def _validate(config: ConfigInput) -> GameConfig:
+    if isinstance(config, (str, bytes)):
+        return GameConfig.model_validate_json(config)
+    if not isinstance(config, GameConfig):
+        return GameConfig.model_validate(config)
+    return config
+
+
+def _compile(key: str, config: GameConfig) -> CompiledConfig:
+    # Only the roles this config can hand out get imported
+    role_settings = {}
+    for role in [*config.roles, FALLBACK_ROLE]:
+        if role not in ROLES or role in role_settings:
+            continue
+        settings = config.roles[role].settings if role in config.roles else {}
+        role_settings[role] = ROLES[role].role_class.parse_settings(settings)
+
+    turn_order = sorted(ROLE_SPECS, key=lambda spec: spec.priority)
+    return CompiledConfig(
+        key=key,
+        config=config,
+        settings=GameSettings.model_validate(config.settings),
+        role_settings=MappingProxyType(role_settings),
+        solver=RoleSolver(config.tags, config.roles),
+        turn_order=tuple(spec.name for spec in turn_order),
+        turn_rank=MappingProxyType({spec.name: spec.priority for spec in turn_order}),
+    )
+
+
+_cache: OrderedDict[str, CompiledConfig] = OrderedDict()
+_lock = threading.Lock()
+
+
+def compile_config(config: ConfigInput) -> CompiledConfig:
+    """
+    Compile a config, or return the cached compile of an identical one.
+
+    Accepts a GameConfig, its dict form, or the JSON string it is stored as.
+    The most recently used CACHE_SIZE configs are kept.
+    """
+    if isinstance(config, CompiledConfig):
+        return config
+
+    key = config_key(config)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    # The compiled key always hashes the validated config, so the same config
+    # given as a string, dict or model compiles to the same key
+    config = _validate(config)
+    canonical_key = config_key(config)
+    with _lock:
+        compiled = _cache.get(canonical_key)
+    if compiled is None:
+        compiled = _compile(canonical_key, config)
+
+    with _lock:
+        _cache[key] = _cache[canonical_key] = compiled
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def clear_config_cache() -> None:
+    with _lock:
+        _cache.clear()
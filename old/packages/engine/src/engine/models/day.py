@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from collections import Counter
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+from engine.models.change_set import ChangeSet
+from engine.utils.logging import logger
+
+if TYPE_CHECKING:
+    from engine.models import Game
+
+
+class Phase(str, Enum):
+    POLL = "POLL"
+    DEFENSE = "DEFENSE"
+    TRIAL = "TRIAL"
+    LYNCH = "LYNCH"
+    OVER = "OVER"
+
+
+class Verdict(str, Enum):
+    GUILTY = "guilty"
+    INNOCENT = "innocent"
+
+
+class Day:
+    """
+    A day's voting. Players vote during POLL until a majority puts someone on
+    trial, who gets their DEFENSE before the rest give their verdicts at
+    TRIAL. A guilty verdict leads to the LYNCH, anything else back to POLL.
+    The day is OVER after a lynch, or once the game's maxPolls polls have
+    gone by without one.
+
+    Votes and verdicts update their counts as they arrive, so each costs O(1)
+    and the majority is always known without a recount. Everyone alive at
+    the start of the day votes, a majority is more than half of them.
+    """
+
+    def __init__(self, game: Game, max_polls: Optional[int] = None) -> None:
+        self.game = game
+        self.max_polls = max_polls or game.compiled.settings.max_polls
+        self.voters = frozenset(actor.number for actor in game.alive_actors)
+        self.phase = Phase.POLL
+        self.polls = 0
+        self.accused: Optional[int] = None
+        self.lynched: Optional[ChangeSet] = None
+
+        # voter -> number, and votes per number
+        self.votes: Dict[int, int] = {}
+        self.counts: Counter = Counter()
+        self.majority: Optional[int] = None
+
+        # voter -> verdict, and verdicts per kind
+        self.verdicts: Dict[int, Verdict] = {}
+        self.verdict_counts: Counter = Counter()
+
+    @property
+    def threshold(self) -> int:
+        """Votes it takes to put someone on trial"""
+        return len(self.voters) // 2 + 1
+
+    @property
+    def guilty(self) -> bool:
+        # Ties go to the accused
+        return (
+            self.verdict_counts[Verdict.GUILTY] > self.verdict_counts[Verdict.INNOCENT]
+        )
+
+    def _expect(self, phase: Phase) -> None:
+        if self.phase != phase:
+            raise ValueError(f"Not allowed during {self.phase.value}")
+
+    def _voter(self, number: int) -> None:
+        if number not in self.voters:
+            raise ValueError(f"Player {number} can't vote today")
+
+    def vote(self, voter: int, number: Optional[int]) -> Optional[int]:
+        """
+        Cast or change :voter's vote, or withdraw it with None. Returns the
+        number with a majority, if anyone has one.
+        """
+        self._expect(Phase.POLL)
+        self._voter(voter)
+        if number is not None and (number not in self.voters or number == voter):
+            raise ValueError(f"Player {voter} can't vote for {number}")
+
+        previous = self.votes.pop(voter, None)
+        if previous is not None:
+            self.counts[previous] -= 1
+            # Only one number can have a majority, so only it can lose one
+            if previous == self.majority and self.counts[previous] < self.threshold:
+                self.majority = None
+
+        if number is not None:
+            self.votes[voter] = number
+            self.counts[number] += 1
+            if self.counts[number] >= self.threshold:
+                self.majority = number
+
+        return self.majority
+
+    def verdict(self, voter: int, verdict: Union[Verdict, str, None]) -> bool:
+        """
+        Give or change :voter's verdict, or withdraw it with None. Returns
+        whether the accused is currently found guilty.
+        """
+        self._expect(Phase.TRIAL)
+        self._voter(voter)
+        if voter == self.accused:
+            raise ValueError("The accused doesn't get a verdict")
+
+        previous = self.verdicts.pop(voter, None)
+        if previous is not None:
+            self.verdict_counts[previous] -= 1
+        if verdict is not None:
+            verdict = Verdict(verdict)
+            self.verdicts[voter] = verdict
+            self.verdict_counts[verdict] += 1
+
+        return self.guilty
+
+    def advance(self) -> Phase:
+        """End the current phase, returns the phase that follows it"""
+        if self.phase == Phase.POLL:
+            self.polls += 1
+            if self.majority is not None:
+                self.accused = self.majority
+                logger.info("Player %s has been put on trial", self.accused)
+                self.phase = Phase.DEFENSE
+            else:
+                logger.info("Poll %s ended without a majority", self.polls)
+                self._next_poll()
+        elif self.phase == Phase.DEFENSE:
+            self.phase = Phase.TRIAL
+        elif self.phase == Phase.TRIAL:
+            if self.guilty:
+                self.phase = Phase.LYNCH
+            else:
+                logger.info("Player %s was found innocent", self.accused)
+                self._next_poll()
+        elif self.phase == Phase.LYNCH:
+            self.lynched = self.game.lynch(self.accused)
+            self.phase = Phase.OVER
+        else:
+            raise ValueError("The day is over")
+
+        return self.phase
+
+    def _next_poll(self) -> None:
+        # Everyone votes again from scratch
+        self.accused = None
+        self.votes.clear()
+        self.counts.clear()
+        self.majority = None
+        self.verdicts.clear()
+        self.verdict_counts.clear()
+        self.phase = Phase.OVER if self.polls >= self.max_polls else Phase.POLL
+
+    def dump(self) -> dict:
+        return {
+            "phase": self.phase.value,
+            "polls": self.polls,
+            "accused": self.accused,
+            "voters": sorted(self.voters),
+            "votes": dict(self.votes),
+            "verdicts": {voter: v.value for voter, v in self.verdicts.items()},
+        }
+
+    @classmethod
+    def load(cls, game: Game, data: dict, max_polls: Optional[int] = None) -> Day:
+        """Pick a day back up from its dump, against the same :game"""
+        day = cls(game, max_polls)
+        # The lynched are still voters of the day they died on
+        day.voters = frozenset(data["voters"])
+        day.polls = data["polls"]
+        day.accused = data["accused"]
+
+        day.phase = Phase.POLL
+        for voter, number in data["votes"].items():
+            day.vote(int(voter), number)
+        day.phase = Phase.TRIAL
+        for voter, verdict in data["verdicts"].items():
+            day.verdict(int(voter), verdict)
+
+        day.phase = Phase(data["phase"])
+        return day
@@ -1,40 +1,70 @@
-import copy
 import random
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from engine.events import ACTION_EVENTS, GameEventGroup
+import engine.snapshot as snapshot
+from engine.events import EventCollector, GameEventGroup
 from engine.models import GameConfig, GameState, Player
-from engine.roles import ROLE_LIST, Actor, import_role
+from engine.models.actor_index import ActorIndex
+from engine.models.change_set import ChangeSet, Fingerprint, fingerprint
+from engine.models.compiled_config import CompiledConfig, ConfigInput, compile_config
+from engine.roles import Actor, import_role
+from engine.roles.actor import NOBODY
 from engine.utils.logging import logger
+from engine.utils.rng import new_seed, reseed
 
 
 class Game:
-    def __init__(self, day: int, players: List[Player], config: GameConfig):
+    def __init__(
+        self, day: int, players: List[Player], config: ConfigInput, seed: int = None
+    ):
         self.day = day
-        self.config = config
+        self.compiled: CompiledConfig = compile_config(config)
+        self.config: GameConfig = self.compiled.config
+        # Every roll of the dice in this game comes from its own seeded stream
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = reseed(random.Random(), self.seed, day)
         self.actors: List[Actor] = []
-        self._graveyard = []
+        # Append only, a record is added as each actor dies
+        self._graveyard: List[dict] = []
         self.events = GameEventGroup(group_id="root")
+        self.collector = EventCollector(self.events)
 
         logger.info("Importing required roles and instantiating actors")
         for index, player in enumerate(players):
             Role = import_role(player.role)
             # Instantiate a Role class with a :player and :roles_settings[role]
-            actor = Role(player, config.roles[player.role].settings)
+            actor = Role(player, self.compiled.role_settings.get(player.role, {}))
+            actor.events = self.collector
+            actor.rng = self.rng
             self.actors.append(actor)
 
+        self.index = ActorIndex(self.actors)
+        self.index.on_death = self.bury
+        for actor in self.actors:
+            actor.index = self.index
+
         self.generate_allies_and_possible_targets()
 
     @classmethod
-    def new(cls, players: List[Player], config: GameConfig):
+    def new(cls, players: List[Player], config: ConfigInput, seed: int = None):
         logger.info("--- Creating a new Game ---")
-        logger.info("Players: {}".format(players))
+        logger.info("Players: %s", players)
 
-        roles, failures = config.generate_roles()
+        # Setup rolls come from the day 0 stream
+        seed = seed if seed is not None else new_seed()
+        rng = reseed(random.Random(), seed, 0)
+
+        config = compile_config(config)
+        if len(players) > config.settings.max_players:
+            raise ValueError(
+                f"{len(players)} players is more than this config's maxPlayers "
+                f"({config.settings.max_players})"
+            )
+        roles, failures = config.solver.solve(rng)
 
         # Assign rules and numbers to players
-        random.shuffle(players)
-        random.shuffle(roles)
+        rng.shuffle(players)
+        rng.shuffle(roles)
 
         # Ensure that there are equal roles to players, pad roles with 'Citizen'
         if len(players) > len(roles):
@@ -45,24 +75,62 @@ class Game:
         for index, player in enumerate(players):
             player.number = index + 1
             player.role = roles[index]
-            logger.info(
-                f"  |-> {player.alias} ({player.name}):".ljust(40) + f" {player.role}"
-            )
+            logger.info("  |-> %s (%s): %s", player.alias, player.name, player.role)
 
-        return cls(1, players, config)
+        return cls(1, players, config, seed)
 
     @classmethod
-    def load(cls, players: List[Player], config: GameConfig, state: GameState):
+    def load(
+        cls,
+        players: List[Player | dict],
+        config: ConfigInput,
+        state: GameState | dict,
+        trusted: bool = False,
+    ):
+        """
+        Rebuild a game from its stored players and state.
+
+        Only pass :trusted for data the engine dumped itself, the players and
+        state are then built without running any pydantic validation.
+        """
+        config = compile_config(config)
+        if trusted:
+            players = [Player.trusted(player) for player in players]
+            state = GameState.trusted(state)
+        else:
+            players = [
+                (
+                    player
+                    if isinstance(player, Player)
+                    else Player.model_validate(player, context=config.player_context)
+                )
+                for player in players
+            ]
+            if not isinstance(state, GameState):
+                state = GameState.model_validate(state)
+
         logger.info("--- Loading Game ---")
-        logger.info("Players: {}".format(players))
+        logger.info("Players: %s", players)
         for player in players:
             logger.info(
-                f"  |-> {player.alias} ({player.name}):".ljust(40)
-                + f" {player.role} {'(DEAD)' if not player.alive else ''}"
+                "  |-> %s (%s): %s %s",
+                player.alias,
+                player.name,
+                player.role,
+                "(DEAD)" if not player.alive else "",
             )
 
-        g = cls(state.day, players, config)
-        g._graveyard = state.graveyard
+        g = cls(state.day, players, config, state.seed)
+        # Graveyards stored before deaths were recorded as they happened may
+        # list an actor more than once, only their first record counts
+        for record in state.graveyard:
+            if not isinstance(record, dict):
+                record = record.model_dump()
+            actor = g.get_actor_by_number(record["number"])
+            if actor is None or actor.cod is not None:
+                continue
+            actor.cod = record["cod"]
+            g._graveyard.append(dict(record))
 
         for actor in g.actors:
             actor.set_targets(
@@ -71,26 +139,81 @@ class Game:
 
         return g
 
+    def fork(self, recording: bool = None) -> "Game":
+        """
+        A branch of this game to play out hypothetical lynches and nights on.
+
+        Nothing is validated or rebuilt. The compiled config, the players and
+        the graveyard records are shared with this game, only the actors are
+        copied (shallowly) and pointed at each other. Whatever happens on the
+        branch leaves this game untouched, and the branch rolls the same dice
+        this game would. :recording defaults to this game's event recording
+        """
+        branch = Game.__new__(Game)
+        branch.day = self.day
+        branch.compiled = self.compiled
+        branch.config = self.config
+        branch.seed = self.seed
+        branch.rng = random.Random()
+        branch.rng.setstate(self.rng.getstate())
+        branch._graveyard = list(self._graveyard)
+        branch.events = GameEventGroup(group_id="root")
+        branch.collector = EventCollector(
+            branch.events,
+            recording=self.collector.recording if recording is None else recording,
+        )
+
+        branch.actors = [
+            actor.fork(branch.collector, branch.rng) for actor in self.actors
+        ]
+        branch.index = ActorIndex(branch.actors)
+        branch.index.on_death = branch.bury
+        for actor in branch.actors:
+            actor.rebind(branch.index)
+
+        return branch
+
     def generate_allies_and_possible_targets(self):
-        for actor in self.alive_actors:
-            actor.find_allies(self.actors)
-            actor.find_possible_targets(self.actors)
+        # Allies never change, so the dead get them too and still win with them
+        for actor in self.actors:
+            actor.find_allies(self.index)
+
+        self.generate_possible_targets()
 
-    def lynch(self, number: int) -> None:
+    def generate_possible_targets(self):
+        # The dead have none, the same as when they're loaded
+        for actor in self.actors:
+            if actor.alive:
+                actor.find_possible_targets(self.index)
+            else:
+                actor.possible_targets = NOBODY
+
+    def fingerprint(self) -> Dict[int, Fingerprint]:
+        return {actor.number: fingerprint(actor) for actor in self.actors}
+
+    def lynch(self, number: int) -> ChangeSet:
         actor = self.get_actor_by_number(number)
         if not actor:
             raise ValueError("Actor not found")
 
+        before, graves = self.fingerprint(), len(self._graveyard)
         actor.lynched()
+        self.generate_possible_targets()
+        return ChangeSet.diff(self.day, before, self.actors, self._graveyard[graves:])
 
-    def resolve(self):
+    def resolve(self) -> ChangeSet:
         logger.info("--- Resolving all player actions ---")
+        before, graves = self.fingerprint(), len(self._graveyard)
         self.day += 1
+        reseed(self.rng, self.seed, self.day)
+
+        for actor in self.actors:
+            actor.new_night()
 
         self.generate_allies_and_possible_targets()
 
         # sort the actors based on turn order
-        self.actors.sort(key=lambda actor: ROLE_LIST.index(actor.__class__))
+        self.actors.sort(key=lambda actor: self.compiled.turn_rank[actor.role_name])
 
         # Prelim check to ensure that players are only targetting valid options
         # This needs to happen BEFORE resolution as Witch can then fuck with the targetting... as God intended
@@ -98,18 +221,17 @@ class Game:
             if not actor.targets:
                 continue
             if actor.targets and not actor.possible_targets:
-                logger.critical(f"{actor} invalid targets ({actor.targets})")
+                logger.critical("%s invalid targets (%s)", actor, actor.targets)
                 logger.info("Clearing targets")
                 actor.clear_targets()
                 continue
 
             for i, target in enumerate(actor.targets):
-                # For each list of possible targets, check if contains selected target
-                p_targets = [p_target for p_target in actor.possible_targets[i]]
-                if target in p_targets:
+                # Check the selected target is in the matching possible targets
+                if actor.can_target(i, target):
                     continue
 
-                logger.critical(f"{actor} invalid targets ({target})")
+                logger.critical("%s invalid targets (%s)", actor, target)
                 logger.info("Clearing targets")
                 actor.clear_targets()
                 break
@@ -119,48 +241,61 @@ class Game:
             if not actor.targets or not actor.alive:
                 continue
 
-            logger.info(f"{actor} is targetting {actor.targets}")
+            logger.info("%s is targetting %s", actor, actor.targets)
 
             # Initialise events group for this action
-            ACTION_EVENTS.reset(
-                new_id=f"{'_'.join(actor.role_name.lower().split(' '))}_action"
+            self.collector.start_action(
+                f"{'_'.join(actor.role_name.lower().split(' '))}_action"
             )
             actor.do_action()
-            if ACTION_EVENTS.events:
-                self.events.new_event_group(copy.deepcopy(ACTION_EVENTS))
+            self.collector.end_action()
 
-        # print(self.events)
-        pass
+        # Tonight's targets are spent, players choose afresh for the next
+        # night. Tomorrow's options, so what's dumped and diffed is what the
+        # next resolve will check targets against
+        for actor in self.actors:
+            actor.clear_targets()
+        self.generate_possible_targets()
+        return ChangeSet.diff(self.day, before, self.actors, self._graveyard[graves:])
 
     def check_for_win(self):
         logger.info("--- Checking for win conditions ---")
-        winners = [
-            actor for actor in self.actors if actor.check_for_win(self.alive_actors)
-        ]
+        # Every actor of a role shares a win condition, so only ask once per role.
+        # Each asks the index's alive counts, nothing rescans the actors
+        results = {}
+        winners = []
+        for actor in self.actors:
+            if actor.__class__ not in results:
+                results[actor.__class__] = actor.check_for_win(self.index)
+            if results[actor.__class__]:
+                winners.append(actor)
+
         if winners:
-            logger.info(f"Winners: {winners}")
+            logger.info("Winners: %s", winners)
             return winners
         else:
             logger.info("No winners found")
             return None
 
     def get_actor_by_number(self, number: int) -> Actor:
-        return next((actor for actor in self.actors if actor.number == number), None)
+        return self.index.get(number)
 
     @property
-    def alive_actors(self) -> List[Actor]:
-        return [actor for actor in self.actors if actor.alive]
+    def alive_actors(self) -> Tuple[Actor, ...]:
+        return self.index.alive_actors
 
     @property
-    def dead_actors(self) -> List[Actor]:
-        # print(
-        #     "DEADIED:", [actor.dump_state() for actor in self.actors if not actor.alive]
-        # )
-        return [actor for actor in self.actors if not actor.alive]
+    def dead_actors(self) -> Tuple[Actor, ...]:
+        return self.index.dead_actors
 
     @property
-    def graveyard(self) -> dict:
-        return self._graveyard + [
+    def graveyard(self) -> List[dict]:
+        return self._graveyard
+
+    def bury(self, actor: Actor) -> None:
+        # Called by the index the moment an actor dies, so the record keeps
+        # the day they actually died on
+        self._graveyard.append(
             {
                 "number": actor.number,
                 "alias": actor.alias,
@@ -169,14 +304,15 @@ class Game:
                 "role": actor.role_name,
                 "will": "actor.will",
             }
-            for actor in self.dead_actors
-        ]
+        )
 
     @property
     def state(self) -> GameState:
-        return GameState(
-            **{
+        # Built from our own actors, so there is nothing to validate
+        return GameState.trusted(
+            {
                 "day": self.day,
+                "seed": self.seed,
                 "players": [
                     {
                         "number": actor.number,
@@ -189,8 +325,46 @@ class Game:
             }
         )
 
-    def dump_state(self):
-        return self.state.model_dump()
+    def dump_state(self) -> dict:
+        return self.dump(actors=False)[0]
+
+    def dump_actors(self) -> List[dict]:
+        return self.dump(state=False)[1]
+
+    def dump(
+        self, state: bool = True, actors: bool = True
+    ) -> Tuple[Optional[dict], Optional[List[dict]]]:
+        """
+        The game's state and its actors' dumps, in a single walk of the actors.
+        Skip either with :state or :actors, it's None in the result.
+        """
+        # A faction shares one allies tuple, so dump it once per faction
+        allies: Dict[int, List[dict]] = {}
+        players, dumps = [], []
+        for actor in self.actors:
+            if state:
+                players.append(
+                    {"number": actor.number, "alias": actor.alias, "alive": actor.alive}
+                )
+            if actors:
+                if id(actor.allies) not in allies:
+                    allies[id(actor.allies)] = actor.dump_allies()
+                dumps.append(actor.dump_state(allies=allies[id(actor.allies)]))
+
+        if not state:
+            return None, dumps
+        dumped = {
+            "day": self.day,
+            "seed": self.seed,
+            "players": players,
+            "graveyard": [dict(record) for record in self._graveyard],
+        }
+        return dumped, dumps if actors else None
+
+    def snapshot(self) -> bytes:
+        """The whole game as a compact binary snapshot, see engine.snapshot"""
+        return snapshot.dump_snapshot(self)
 
-    def dump_actors(self):
-        return [actor.dump_state() for actor in self.actors]
+    @classmethod
+    def from_snapshot(cls, data: bytes, config: ConfigInput) -> "Game":
+        return snapshot.load_snapshot(data, config)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, List, Mapping, Optional
 from pydantic import BaseModel, ConfigDict
 
 
@@ -22,5 +22,32 @@ class StateGraveyardRecord(BaseModel):
 class GameState(BaseModel):
     model_config = ConfigDict(extra="forbid")
     day: int = 0
+    seed: Optional[int] = None
     players: List[StatePlayer] = []
     graveyard: List[StateGraveyardRecord] = []
+
+    @classmethod
+    def trusted(cls, data: Mapping[str, Any]) -> "GameState":
+        """Build a GameState from data the engine dumped itself, skipping validation"""
+        if isinstance(data, cls):
+            return data
+        return cls.model_construct(
+            day=data.get("day", 0),
+            seed=data.get("seed"),
+            players=[
+                (
+                    player
+                    if isinstance(player, StatePlayer)
+                    else StatePlayer.model_construct(**player)
+                )
+                for player in data.get("players", [])
+            ],
+            graveyard=[
+                (
+                    record
+                    if isinstance(record, StateGraveyardRecord)
+                    else StateGraveyardRecord.model_construct(**record)
+                )
+                for record in data.get("graveyard", [])
+            ],
+        )
@@ -1,6 +1,21 @@
-from typing import Any, List, Mapping, Optional
+from typing import Any, List, Mapping, Optional, Tuple
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+
+from engine.utils.bitset import mask_of
+
+# Defaults, a game can raise them by validating its players with
+# context={"max_players": ..., "max_target_slots": ...}
+MAX_PLAYERS = 15
+MAX_TARGET_SLOTS = 2
+
+
+def player_limits(info: ValidationInfo) -> Tuple[int, int]:
+    context = info.context or {}
+    return (
+        context.get("max_players", MAX_PLAYERS),
+        context.get("max_target_slots", MAX_TARGET_SLOTS),
+    )
 
 
 class Player(BaseModel):
@@ -11,41 +26,81 @@ class Player(BaseModel):
     role: Optional[str] = None
     number: Optional[int] = None
     alive: Optional[bool] = True
-    possible_targets: Optional[List[List[int]]] = Field(
-        default_factory=list, max_length=2, alias="possibleTargets"
+    # One bitset of player numbers per target slot, see engine.utils.bitset.
+    # Dumped as lists of player numbers
+    possible_targets: Optional[List[int]] = Field(
+        default_factory=list, alias="possibleTargets"
     )
-    targets: Optional[List[int]] = Field(default_factory=list, max_length=15)
-    allies: Optional[List[dict]] = Field(default_factory=list, max_length=15)
+    targets: Optional[List[int]] = Field(default_factory=list)
+    allies: Optional[List[dict]] = Field(default_factory=list)
     role_actions: Optional[Mapping[str, Any]] = Field(
         default_factory=dict, alias="roleActions"
     )
 
+    @classmethod
+    def trusted(cls, data: Mapping[str, Any]) -> "Player":
+        """Build a Player from data the engine dumped itself, skipping validation"""
+        if isinstance(data, cls):
+            return data
+        possible_targets = data.get("possibleTargets")
+        if possible_targets and any(
+            isinstance(slot, list) for slot in possible_targets
+        ):
+            data = {
+                **data,
+                "possibleTargets": cls.pack_possible_targets(possible_targets),
+            }
+        return cls.model_construct(**data)
+
     @field_validator("number")
     @classmethod
-    def validate_number(cls, v):
-        if not (1 <= v <= 15):
-            raise ValueError("Number must be between 1 and 15 inclusive")
+    def validate_number(cls, v, info: ValidationInfo):
+        max_players, _ = player_limits(info)
+        if not (1 <= v <= max_players):
+            raise ValueError(f"Number must be between 1 and {max_players} inclusive")
         return v
 
     @field_validator("targets")
     @classmethod
-    def validate_target_lists(cls, v):
+    def validate_target_lists(cls, v, info: ValidationInfo):
+        max_players, _ = player_limits(info)
+        if len(v) > max_players:
+            raise ValueError(f"targets cannot have more than {max_players} items")
         for el in v:
-            if not (1 <= el <= 15):
-                raise ValueError("All values must be between 1 and 15 inclusive")
+            if not (1 <= el <= max_players):
+                raise ValueError(
+                    f"All values must be between 1 and {max_players} inclusive"
+                )
+        return v
+
+    @field_validator("allies")
+    @classmethod
+    def validate_allies(cls, v, info: ValidationInfo):
+        max_players, _ = player_limits(info)
+        if len(v) > max_players:
+            raise ValueError(f"allies cannot have more than {max_players} items")
+        return v
+
+    @field_validator("possible_targets", mode="before")
+    @classmethod
+    def pack_possible_targets(cls, v):
+        # Dumps store each slot as a list of player numbers
+        if isinstance(v, list):
+            return [mask_of(slot) if isinstance(slot, list) else slot for slot in v]
         return v
 
     @field_validator("possible_targets")
     @classmethod
-    def validate_possible_targets(cls, v):
-        if len(v) > 2:
-            raise ValueError("possible_targets list cannot have more than 2 lists")
-        for sublist in v:
-            if len(sublist) > 15:
+    def validate_possible_targets(cls, v, info: ValidationInfo):
+        max_players, max_slots = player_limits(info)
+        if len(v) > max_slots:
+            raise ValueError(
+                f"possible_targets list cannot have more than {max_slots} lists"
+            )
+        for mask in v:
+            # Bits 1 to max_players are the only valid player numbers
+            if mask < 0 or mask & 1 or mask >> (max_players + 1):
                 raise ValueError(
-                    "Sublists in possible_targets cannot have more than 15 items"
+                    f"All values must be between 1 and {max_players} inclusive"
                 )
-
-            if any(not (1 <= item <= 15) for item in sublist):
-                raise ValueError("All values must be between 1 and 15 inclusive")
         return v
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import engine.templates as templates
+from engine.models.change_set import ChangeSet
+
+
+@dataclass
+class ResolveResult:
+    """
+    Everything a resolve produces, built once by engine.resolve and ready to
+    serialise. dump() gives the dict resolve_game returns.
+
+    The night's events are only shipped as the timeline, each entry carries
+    its group_id and offset. Callers that want them per recipient can build
+    that with engine.events.index_by_recipient.
+
+    :metrics holds the seconds spent loading, resolving, checking for a win
+    and dumping the game ("load", "resolve", "checkForWin", "dump", "total"),
+    plus the "actors" and "events" counts.
+    """
+
+    state: dict
+    actors: List[dict]
+    # Every event with its offset in seconds from the start of the night
+    timeline: List[dict]
+    duration: int
+    changes: ChangeSet
+    winners: Optional[List[int]]
+    log: List[dict] = field(default_factory=list)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    def dump(self, metrics: bool = True) -> dict:
+        """Leave out :metrics for a result that only depends on the game"""
+        result = {
+            "state": self.state,
+            "actors": self.actors,
+            "timeline": self.timeline,
+            "duration": self.duration,
+            # Which catalogue the events' templates come from
+            "templates": templates.VERSION,
+            "changes": self.changes.dump(),
+            "winners": self.winners,
+            "log": self.log,
+        }
+        if metrics:
+            result["metrics"] = self.metrics
+        return result
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple
+
+from engine.roles import ROLE_TAGS_MAP
+from engine.utils.logging import logger
+
+if TYPE_CHECKING:
+    from engine.models.game_config import RoleSettings
+
+FALLBACK_ROLE = "Citizen"
+
+
+class RoleSolver:
+    """
+    Assigns one role to every tag in a config without ever exceeding a role's max.
+
+    The tag -> roles tables are built once up front, along with the number of
+    tags that no assignment can fill. Each pick is then a weighted draw over
+    the roles that still leave the remaining tags fillable, so generation
+    never paints itself into a corner and never needs to be retried.
+    """
+
+    def __init__(self, tags: Sequence[str], roles: Mapping[str, RoleSettings]):
+        self.tags = list(tags)
+        self.capacity = {role: settings.max for role, settings in roles.items()}
+
+        # tag -> (roles, weights). A role fills a tag if it carries the tag or
+        # is named by it; roles that can never be picked are left out
+        self.table: Dict[str, Tuple[Tuple[str, ...], Tuple[float, ...]]] = {}
+        for tag in dict.fromkeys(self.tags):
+            options = [
+                (role, settings.weight)
+                for role, settings in roles.items()
+                if settings.max > 0
+                and settings.weight > 0
+                and (tag in ROLE_TAGS_MAP.get(role, ()) or tag == role)
+            ]
+            self.table[tag] = (
+                tuple(role for role, _ in options),
+                tuple(weight for _, weight in options),
+            )
+
+        # Fill the most constrained tags first, tags with no options go last
+        self.order = sorted(
+            range(len(self.tags)),
+            key=lambda slot: (
+                len(self.table[self.tags[slot]][0]) == 0,
+                len(self.table[self.tags[slot]][0]),
+            ),
+        )
+
+        matched = self._match(self.order, self.capacity)
+        self.fillable = len(matched)
+        self.unfillable = [
+            self.tags[slot] for slot in self.order if slot not in matched
+        ]
+
+    @property
+    def feasible(self) -> bool:
+        return not self.unfillable
+
+    def _match(self, slots: List[int], capacity: Mapping[str, int]) -> Dict[int, str]:
+        """Maximum assignment of slots to roles under :capacity (augmenting paths)"""
+        assigned: Dict[str, List[int]] = {role: [] for role in capacity}
+        match: Dict[int, str] = {}
+
+        def augment(slot: int, seen: set) -> bool:
+            for role in self.table[self.tags[slot]][0]:
+                if role in seen:
+                    continue
+                seen.add(role)
+                if len(assigned[role]) < capacity[role]:
+                    assigned[role].append(slot)
+                    match[slot] = role
+                    return True
+                for index, other in enumerate(assigned[role]):
+                    if augment(other, seen):
+                        assigned[role][index] = slot
+                        match[slot] = role
+                        return True
+            return False
+
+        for slot in slots:
+            augment(slot, set())
+        return match
+
+    def solve(self, rng: random.Random = random) -> Tuple[List[str], List[str]]:
+        """Returns the roles in tag order, and the tags that fell back to Citizen"""
+        logger.info("--- Generating roles ---")
+        logger.info("Tags: %s", self.tags)
+
+        capacity = dict(self.capacity)
+        remaining = list(self.order)
+        fillable = self.fillable
+        roles: List[str] = [FALLBACK_ROLE] * len(self.tags)
+        failed_roles = []
+
+        while remaining:
+            slot = remaining.pop(0)
+            tag = self.tags[slot]
+            options, weights = self.table[tag]
+
+            # Keep the roles that still leave every other fillable tag fillable
+            choices, choice_weights = [], []
+            for role, weight in zip(options, weights):
+                if capacity[role] == 0:
+                    continue
+                capacity[role] -= 1
+                if len(self._match(remaining, capacity)) == fillable - 1:
+                    choices.append(role)
+                    choice_weights.append(weight)
+                capacity[role] += 1
+
+            if not choices:
+                logger.warning("Picking %s: %s <--- FAILED!!!", tag, FALLBACK_ROLE)
+                failed_roles.append(tag)
+                continue
+
+            choice = rng.choices(choices, weights=choice_weights, k=1)[0]
+            logger.info("Picking %s: %s", tag, choice)
+            capacity[choice] -= 1
+            fillable -= 1
+            roles[slot] = choice
+
+        if len(failed_roles) > 0:
+            logger.warning("Number of failures: %s", len(failed_roles))
+        logger.info("Roles: %s", roles)
+        return roles, failed_roles
@@ -1,29 +1,28 @@
-from typing import List
+from typing import List, Type
 
 from engine.roles.actor import Actor
-from engine.roles.bodyguard import Bodyguard
-from engine.roles.citizen import Citizen
-from engine.roles.doctor import Doctor
-from engine.roles.godfather import Godfather
-from engine.roles.mafioso import Mafioso
-from engine.utils import class_for_name
+from engine.roles.registry import (  # noqa: F401
+    ROLE_SPECS,
+    ROLES,
+    ROLES_BY_ID,
+    RoleSpec,
+    get_role,
+)
 
-# This is also turn order
-ROLE_LIST: List[Actor] = [
-    # ---   Role Blocking       --- #
-    # ---   Self Protecting     --- #
-    Citizen,
-    # ---   Target Protecting   --- #
-    Doctor,
-    Bodyguard,
-    # ---   Killing             --- #
-    Godfather,
-    Mafioso,
-    # ---   Investigative       --- #
-]
+ROLE_TAGS_MAP = {spec.name: list(spec.tags) for spec in ROLE_SPECS}
 
-ROLE_TAGS_MAP = {role.__name__: role.tags for role in ROLE_LIST}
 
+def import_role(role_name: str) -> Type[Actor]:
+    return get_role(role_name).role_class
 
-def import_role(role_name: str):
-    return class_for_name("engine.roles", role_name)
+
+def __getattr__(name: str):
+    # Role classes are imported on first use, see engine.roles.registry
+    if name in ROLES:
+        return ROLES[name].role_class
+    if name == "ROLE_LIST":
+        role_list: List[Type[Actor]] = [
+            spec.role_class for spec in sorted(ROLE_SPECS, key=lambda s: s.priority)
+        ]
+        return role_list
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,73 @@
 from __future__ import annotations
 
+import copy
+import random
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Callable, List
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
 
 import engine.events as events
 import engine.roles as roles
-from engine.events import ACTION_EVENTS
 from engine.models import Player
+from engine.models.actor_index import ActorIndex
+from engine.utils.bitset import bit, numbers_of
 from engine.utils.logging import logger
 
+# Shared by every actor whose list of allies, visitors, targets etc is empty,
+# a list is only allocated for an actor once it has something to hold
+NOBODY: tuple = ()
+
+# Keys of a dumped actor, in Player field order. The actor fills in
+# _ACTOR_KEYS itself, every other Player field is copied from its player
+_ACTOR_KEYS = (
+    "alias",
+    "number",
+    "alive",
+    "possibleTargets",
+    "targets",
+    "allies",
+    "roleActions",
+)
+_DUMP_TEMPLATE = dict.fromkeys(
+    field.alias or name for name, field in Player.model_fields.items()
+)
+_COPIED_FIELDS = tuple(
+    (name, field.alias or name)
+    for name, field in Player.model_fields.items()
+    if (field.alias or name) not in _ACTOR_KEYS
+)
+
 
 class Actor(ABC):
     tags = ["any_random"]
+    settings_model: Optional[Type[BaseModel]] = None
+
+    # Games keep thousands of actors around, so none of them carry a __dict__.
+    # Roles declare slots for whatever state they add
+    __slots__ = (
+        "alignment",
+        "player",
+        "alias",
+        "number",
+        "bit",
+        "events",
+        "rng",
+        "index",
+        "_alive",
+        "allies",
+        "possible_targets",
+        "visitors",
+        "bodyguards",
+        "doctors",
+        "night_immune",
+        "targets",
+        "visiting",
+        "home",
+        "kill_reason",
+        "cod",
+    )
 
     def __init__(self, player: Player) -> None:
         self.alignment = None
@@ -21,67 +76,144 @@ class Actor(ABC):
         self.player = player
         self.alias = player.alias
         self.number = player.number
+        self.bit = bit(self.number) if self.number else 0
+
+        # Where this actor reports events, rolls dice and reports its deaths.
+        # The Game swaps in its own, an actor outside a Game has no rng and
+        # rolls with the random module
+        self.events = events.EventCollector()
+        self.rng: Optional[random.Random] = None
+        self.index: ActorIndex = None
+
         self.alive = player.alive
 
         # State
-        self.allies: List[Actor] = []
-        self.possible_targets: List[List[Actor]] = []
-        self.visitors: List[Actor] = []
-        self.bodyguards: List[roles.Bodyguard] = []
-        self.doctors: List[roles.Doctor] = []  # TODO
+        self.allies: Tuple[Actor, ...] = NOBODY
+        # One bitset of player numbers per target slot, see engine.utils.bitset
+        self.possible_targets: List[int] = NOBODY
+        self.visitors: List[Actor] = NOBODY
+        self.bodyguards: List[roles.Bodyguard] = NOBODY
+        self.doctors: List[roles.Doctor] = NOBODY  # TODO
         self.night_immune: bool = False
         # Action
+        self.targets: List[Actor] = NOBODY
         self.visiting: Actor = None
+        self.home = True
         self.kill_reason = "How they died is unknown"
+        self.cod: str = None
+
+    @property
+    def alive(self) -> bool:
+        return self._alive
+
+    @alive.setter
+    def alive(self, alive: bool) -> None:
+        self._alive = alive
+        if self.index is not None:
+            self.index.update(self)
+
+    @classmethod
+    def parse_settings(cls, settings: Any) -> Any:
+        """Validate raw role settings, settings that are already parsed pass through"""
+        if cls.settings_model is None or isinstance(settings, cls.settings_model):
+            return settings
+        return cls.settings_model.model_validate(settings)
 
     @property
     def role_name(self) -> str:
         return self.__class__.__name__
 
-    def dump_state(self):
-        # print(self)
-        # Returns the base player used to construct the Actor, and some actor fields
-        return {
-            **self.player.model_dump(by_alias=True),
-            **{
-                "number": self.number,
-                # 'house': self.house,
-                "alive": self.alive,
-                "possibleTargets": [  # self.possible_targets is a list of lists [[], []]. Need to loop through the internal lists and convert the actors to just their numbers
-                    [actor.number for actor in pos_targets_list]
-                    for pos_targets_list in self.possible_targets
-                ],
-                "targets": [],
-                "allies": [
-                    {
-                        "alias": ally.alias,
-                        "number": ally.number,
-                        "role": ally.role_name,
-                        "alive": ally.alive,
-                    }
-                    for ally in self.allies
-                ],
-                "alias": self.alias,
-                # 'events': self.events
-            },
-        }
+    def dump_state(self, allies: List[dict] = None):
+        # :allies is our dump_allies, when the caller has already built it
+        # The Player fields we don't overwrite are copied from our player
+        # rather than paying for a model_dump per actor per dump
+        dump = _DUMP_TEMPLATE.copy()
+        player = self.player
+        for name, key in _COPIED_FIELDS:
+            dump[key] = getattr(player, name)
+        dump["alias"] = self.alias
+        dump["number"] = self.number
+        dump["alive"] = self.alive
+        # Bitsets inside the engine, player numbers once dumped. JSON clients
+        # can't hold masks past 53 players
+        dump["possibleTargets"] = [numbers_of(mask) for mask in self.possible_targets]
+        dump["targets"] = []
+        dump["allies"] = allies if allies is not None else self.dump_allies()
+        dump["roleActions"] = self.dump_role_actions()
+        return dump
+
+    def dump_allies(self) -> List[dict]:
+        return [
+            {
+                "alias": ally.alias,
+                "number": ally.number,
+                "role": ally.role_name,
+                "alive": ally.alive,
+            }
+            for ally in self.allies
+        ]
+
+    def dump_role_actions(self) -> dict:
+        # Whatever a role needs to remember between nights, eg. vests left
+        return dict(self.player.role_actions)
 
     def __repr__(self) -> str:
         return f"|{self.role_name}| {self.alias}({self.number})"
 
-    def find_allies(self, actors: List[Actor] = None) -> List[Actor] | None:
-        self.allies = []
+    def find_allies(
+        self, actors: ActorIndex | List[Actor] = None
+    ) -> Tuple[Actor, ...] | None:
+        self.allies = NOBODY
         return self.allies
 
-    def find_possible_targets(self, actors: List[Actor] = None) -> List[Actor] | None:
-        self.possible_targets = []
+    def find_possible_targets(
+        self, actors: ActorIndex | List[Actor] = None
+    ) -> List[int] | None:
+        self.possible_targets = NOBODY
         return self.possible_targets
 
+    def can_target(self, slot: int, target: Actor) -> bool:
+        return slot < len(self.possible_targets) and bool(
+            self.possible_targets[slot] & target.bit
+        )
+
+    def new_night(self) -> None:
+        # Forget who visited/protected us last night so a Game can resolve again.
+        # Lists are cleared in place, a forked actor gets its own in rebind
+        for visits in (self.visitors, self.bodyguards, self.doctors):
+            if visits:
+                visits.clear()
+        self.night_immune = False
+        self.visiting = None
+        self.home = True
+
+    def fork(self, events: events.EventCollector, rng: random.Random) -> Actor:
+        """Shallow copy for Game.fork, rebind it once every actor is copied"""
+        actor = copy.copy(self)
+        actor.events = events
+        actor.rng = rng
+        actor.index = None
+        return actor
+
+    def rebind(self, index: ActorIndex) -> None:
+        # Point a forked actor's references at the actors in its own game
+        self.index = index
+        self.find_allies(index)
+        self.possible_targets = list(self.possible_targets) or NOBODY
+        self.targets = [index.get(target.number) for target in self.targets] or NOBODY
+        self.visitors = [index.get(actor.number) for actor in self.visitors] or NOBODY
+        self.bodyguards = [
+            index.get(actor.number) for actor in self.bodyguards
+        ] or NOBODY
+        self.doctors = [index.get(actor.number) for actor in self.doctors] or NOBODY
+        if self.visiting is not None:
+            self.visiting = index.get(self.visiting.number)
+
     def set_targets(self, targets: List[Actor]):
         self.targets = targets
 
     def clear_targets(self) -> None:
-        self.targets = []
+        self.targets = NOBODY
 
     def do_action(self):
         self.action()
@@ -91,12 +223,27 @@ class Actor(ABC):
         pass
 
     def visit(self, target: Actor) -> None:
-        logger.info(f"{self} is visiting {target}'s house")
+        logger.info("%s is visiting %s's house", self, target)
         self.home = False
         self.visiting = target
-        target.visitors.append(self)
+        target.add_visitor(self)
         return
 
+    def add_visitor(self, actor: Actor) -> None:
+        if self.visitors is NOBODY:
+            self.visitors = []
+        self.visitors.append(actor)
+
+    def add_bodyguard(self, bodyguard: roles.Bodyguard) -> None:
+        if self.bodyguards is NOBODY:
+            self.bodyguards = []
+        self.bodyguards.append(bodyguard)
+
+    def add_doctor(self, doctor: roles.Doctor) -> None:
+        if self.doctors is NOBODY:
+            self.doctors = []
+        self.doctors.append(doctor)
+
     def kill(
         self,
         target: Actor,
@@ -104,7 +251,7 @@ class Actor(ABC):
         fail: Callable[[None], None],
         true_death: bool = False,
     ) -> None:
-        logger.info(f"{self} is attempting to kill {target}")
+        logger.info("%s is attempting to kill %s", self, target)
 
         self.visit(target)
 
@@ -112,9 +259,14 @@ class Actor(ABC):
             bg = target.bodyguards.pop(0)
             bg.shootout(self)
         elif target.night_immune:
-            logger.info(f"{self} failed to kill {target} because they are night-immune")
+            logger.info(
+                "%s failed to kill %s because they are night-immune", self, target
+            )
             fail()
 
+            if not self.events.recording:
+                return
+
             # Night Immunity event group
             survive_event_group = events.GameEventGroup(
                 group_id=events.Common.NIGHT_IMMUNE
@@ -125,11 +277,11 @@ class Actor(ABC):
                 events.GameEvent(
                     event_id=events.Common.NIGHT_IMMUNE,
                     targets=[target.player.id],
-                    message="You were attacked tonight but survived due to Night Immunity",
+                    template="night_immune",
                 )
             )
 
-            ACTION_EVENTS.new_event_group(survive_event_group)
+            self.events.new_event_group(survive_event_group)
 
         else:
             success()
@@ -140,25 +292,24 @@ class Actor(ABC):
         self.die(reason, true_death=True)
 
     def die(self, reason: str = None, true_death: bool = False) -> None:
-        self.doctors = [
-            doctor for doctor in self.doctors if doctor.alive
-        ]  # Remove any dead doctors
+        if self.doctors:
+            self.doctors[:] = [
+                doctor for doctor in self.doctors if doctor.alive
+            ]  # Remove any dead doctors
 
-        self.alive = False
-        if true_death:
-            pass
-        elif self.doctors:
+        if not true_death and self.doctors:
             doctor = self.doctors.pop(0)
             doctor.revive_target(self)
-            self.alive = True
             return
 
-        print("SOMEONE IS DIE HERE", reason)
+        # Cause of death first, the Game buries us as soon as we're marked dead
         self.cod = reason
-        logger.info(f"{self} died. Cause of death: {reason}")
+        self.alive = False
+        logger.info("%s died. Cause of death: %s", self, reason)
 
     @abstractmethod
-    def check_for_win(self, actors: List[Actor]) -> bool:
+    def check_for_win(self, actors: ActorIndex | List[Actor]) -> bool:
+        """:actors is the Game's index, or a list of the living actors"""
         pass
 
 
@@ -168,39 +319,43 @@ class Alignment(Enum):
 
 
 class Town(Actor):
+    __slots__ = ()
+
     def __init__(self, player: Player) -> None:
         super().__init__(player)
         self.alignment = Alignment.TOWN
 
-    def check_for_win(self, actors: List[Actor]) -> bool:
+    def check_for_win(self, actors: ActorIndex | List[Actor]) -> bool:
         # TODO: This need to be expanded such that citizen wins with Neutral Benign etc
-        enemies = []
-        enemies.extend(
-            [actor for actor in actors if actor.alignment in [Alignment.MAFIA]]
-        )
-        if enemies:
-            return False
-        else:
-            return True
+        index = ActorIndex.of(actors)
+        return index.alive_count(Alignment.MAFIA) == 0
 
 
 class Mafia(Actor):
+    __slots__ = ()
+
     def __init__(self, player: Player) -> None:
         super().__init__(player)
         self.alignment = Alignment.MAFIA
         self.kill_reason = "They were found riddled with bullets"
 
-    def find_allies(self, actors: List[Actor] = []) -> List[Actor]:
-        self.allies = [actor for actor in actors if actor.alignment == self.alignment]
+    def find_allies(self, actors: ActorIndex | List[Actor] = []) -> None:
+        if isinstance(actors, ActorIndex):
+            # Every member of the faction shares the index's tuple, so finding
+            # allies costs the same for a faction of 3 or 300
+            self.allies = actors.alignment(self.alignment)
+        else:
+            self.allies = tuple(
+                actor for actor in actors if actor.alignment == self.alignment
+            )
 
-    def check_for_win(self, actors: List[Actor]):
-        enemies = [actor for actor in actors if actor not in self.allies]
+    def check_for_win(self, actors: ActorIndex | List[Actor]) -> bool:
+        # Allies are everyone sharing our alignment, anyone else alive is an enemy.
+        # The faction wins as a whole, dead or alive, the same as the Town
+        index = ActorIndex.of(actors)
         # wins_with = [
         #     "neutral_benign",
         #     "neutral_evil",
         # ]  # TODO: Not sure if this should be tags or explicily stating roles. Probably roles
 
-        if enemies:
-            return False
-        else:
-            return True
+        return index.alive_count() == index.alive_count(self.alignment)
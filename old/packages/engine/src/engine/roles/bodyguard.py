@@ -1,8 +1,10 @@
+from __future__ import annotations
+
 from typing import List
 
 import engine.events as events
-from engine.events import ACTION_EVENTS
 from engine.models import Player
+from engine.models.actor_index import ActorIndex
 
 # from engine.roles import Actor
 from engine.roles.actor import Actor, Town
@@ -12,31 +14,41 @@ from engine.utils.logging import logger
 class Bodyguard(Town):
     tags = ["any_random", "town_random", "town_protective", "town_killing"]
 
+    __slots__ = ("guarding",)
+
     def __init__(self, player: Player, settings: dict = dict()):
         super().__init__(player)
         # self.role_name = "Bodyguard"
+        self.guarding: Actor = None
 
-    def find_possible_targets(self, actors: List[Actor] = None) -> List[Actor]:
-        num_targets = 1
-        self.possible_targets = []
-        for i in range(num_targets):
-            self.possible_targets.insert(
-                i,
-                [actor for actor in actors if actor.alive and actor != self],
-            )
+    def find_possible_targets(self, actors: ActorIndex | List[Actor]) -> List[int]:
+        index = ActorIndex.of(actors)
+        # Anyone alive but ourselves
+        self.possible_targets = [index.alive_mask & ~self.bit]
         return self.possible_targets
 
     def action(self):
         target = self.targets[0]
-        logger.info(f"{self} will protect {target}")
+        logger.info("%s will protect %s", self, target)
         self.visit(target)
-        target.bodyguards.append(
-            self
-        )  # Add self into the list of bodyguards protecting this target
+        # Add self into the list of bodyguards protecting this target
+        target.add_bodyguard(self)
         self.guarding = target
 
+    def rebind(self, index: ActorIndex) -> None:
+        super().rebind(index)
+        if self.guarding is not None:
+            self.guarding = index.get(self.guarding.number)
+
     def shootout(self, attacker: Actor):
-        logger.info(f"{self} defends their target from {attacker}")
+        logger.info("%s defends their target from %s", self, attacker)
+        if self.events.recording:
+            self.shootout_events(attacker)
+
+        self.die("Died in a shootout")
+        attacker.die("Died in a shootout")
+
+    def shootout_events(self, attacker: Actor):
         shootout_event_group = events.GameEventGroup(
             group_id="shootout", duration=events.Duration.SHOOTOUT
         )
@@ -46,7 +58,7 @@ class Bodyguard(Town):
             events.GameEvent(
                 event_id="bodyguard_shootout",
                 targets=["*"],
-                message="You hear sounds of a shootout",
+                template="shootout",
             )
         )
 
@@ -56,7 +68,7 @@ class Bodyguard(Town):
             events.GameEvent(
                 event_id="bodyguard_protected",
                 targets=[self.guarding.player.id],
-                message="You were protected by a bodyguard",
+                template="protected_by_bodyguard",
             )
         )
 
@@ -65,7 +77,7 @@ class Bodyguard(Town):
             events.GameEvent(
                 event_id="bodyguard_protected",
                 targets=[attacker.player.id],
-                message="You were killed by the Bodyguard defending your target",
+                template="killed_by_bodyguard",
             )
         )
 
@@ -74,11 +86,8 @@ class Bodyguard(Town):
             events.GameEvent(
                 event_id="bodyguard_protected",
                 targets=[self.player.id],
-                message="You died defending your target",
+                template="died_defending",
             )
         )
 
-        ACTION_EVENTS.new_event_group(shootout_event_group)
-
-        self.die("Died in a shootout")
-        attacker.die("Died in a shootout")
+        self.events.new_event_group(shootout_event_group)
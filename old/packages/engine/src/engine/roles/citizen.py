@@ -1,9 +1,12 @@
+from __future__ import annotations
+
 from typing import List
 
 from pydantic import BaseModel, Field
 
 from engine.models import Player
-from engine.roles.actor import Actor, Town
+from engine.models.actor_index import ActorIndex
+from engine.roles.actor import NOBODY, Actor, Town
 from engine.utils.logging import logger
 
 
@@ -13,47 +16,53 @@ class CitizenSettings(BaseModel):
 
 class Citizen(Town):
     tags = ["any_random", "town_random", "town_government"]
+    settings_model = CitizenSettings
+
+    __slots__ = ("settings", "remaining_vests")
 
     def __init__(self, player: Player, settings: dict = dict()):
         super().__init__(player)
         # self.role_name = 'Citizen'
-        self.settings = CitizenSettings.model_validate(settings)
+        self.settings = self.parse_settings(settings)
         self.remaining_vests = player.role_actions.get(
             "remainingVests", self.settings.max_vests
         )
 
-    def dump_state(self):
-        return {
-            **super().dump_state(),
-            **{"roleActions": {"remainingVests": self.remaining_vests}},
-        }
+    def dump_role_actions(self) -> dict:
+        return {"remainingVests": self.remaining_vests}
 
-    def check_for_win(self, actors: List[Actor]) -> bool:
+    def check_for_win(self, actors: ActorIndex | List[Actor]) -> bool:
+        index = ActorIndex.of(actors)
         # Check if the faction has won
-        faction_win = super().check_for_win(actors)
+        faction_win = super().check_for_win(index)
         if faction_win:
             return faction_win
 
         # Check if role has won via special conditions
-        if len(actors) == 2 and any(isinstance(actor, Citizen) for actor in actors):
-            print("role win", actors)
+        if index.alive_count() == 2 and index.alive_role_count(self.role_name):
+            logger.info("Citizen wins the tie: %s", index.alive_actors)
             return True  # Citizen wins ties
 
         return False
 
-    def find_possible_targets(self, actors: List[Actor] = None) -> None:
-        self.possible_targets = []
+    def find_possible_targets(self, actors: ActorIndex | List[Actor] = None) -> None:
+        self.possible_targets = NOBODY
         if self.remaining_vests > 0:
-            self.possible_targets = [[self]]
+            self.possible_targets = [self.bit]
 
     def action(self) -> None:
         if not self.remaining_vests > 0:
-            logger.critical(f"{self} tried to use vest but has 0 remaining")
+            logger.critical("%s tried to use vest but has 0 remaining", self)
             return
 
         self.remaining_vests -= 1
         target = self.targets[0]
         target.night_immune = True
         logger.info(
-            f"|{self.role_name}| {self.alias}({self.number}) used vest on {'self' if target == self else target}. {self.remaining_vests} remaining"
+            "|%s| %s(%s) used vest on %s. %s remaining",
+            self.role_name,
+            self.alias,
+            self.number,
+            "self" if target == self else target,
+            self.remaining_vests,
         )
@@ -1,6 +1,10 @@
+from __future__ import annotations
+
+from typing import List
+
 import engine.events as events
-from engine.events import ACTION_EVENTS
 from engine.models import Player
+from engine.models.actor_index import ActorIndex
 
 # from engine.roles import Actor
 from engine.roles.actor import Actor, Town
@@ -10,28 +14,28 @@ from engine.utils.logging import logger
 class Doctor(Town):
     tags = ["any_random", "town_random", "town_protective"]
 
+    __slots__ = ()
+
     def __init__(self, player: Player, settings: dict = dict()):
         super().__init__(player)
 
-    def find_possible_targets(self, actors):
-        num_targets = 1
-        self.possible_targets = []
-        for i in range(num_targets):
-            self.possible_targets.insert(
-                i,
-                [actor for actor in actors if actor.alive and actor != self],
-            )
+    def find_possible_targets(self, actors: ActorIndex | List[Actor]) -> List[int]:
+        index = ActorIndex.of(actors)
+        # Anyone alive but ourselves
+        self.possible_targets = [index.alive_mask & ~self.bit]
+        return self.possible_targets
 
     def action(self) -> None:
         target = self.targets[0]
-        logger.info(f"{self} will attempt to heal {target}")
+        logger.info("%s will attempt to heal %s", self, target)
         self.visit(target)
-        target.doctors.append(
-            self
-        )  # Add self into the list of doctors protecting this target
+        # Add self into the list of doctors protecting this target
+        target.add_doctor(self)
 
     def revive_target(self, target: Actor) -> None:
-        logger.info(f"{self} revives {target}")
+        logger.info("%s revives %s", self, target)
+        if not self.events.recording:
+            return
 
         # Event group for the revival
         revive_event_group = events.GameEventGroup(group_id="doctor_revive")
@@ -40,8 +44,8 @@ class Doctor(Town):
         revive_event_group.new_event(
             events.GameEvent(
                 event_id="doctor_revive_success",
-                targets=self.player.id,
-                message="Your target was attacked last night, but you successfully revived them",
+                targets=[self.player.id],
+                template="revived_target",
             )
         )
 
@@ -52,8 +56,8 @@ class Doctor(Town):
             events.GameEvent(
                 event_id="revive_by_doctor",
                 targets=[target.player.id],
-                message="You were revived by a doctor. Rock on",
+                template="revived_by_doctor",
             )
         )
 
-        ACTION_EVENTS.new_event_group(revive_event_group)
+        self.events.new_event_group(revive_event_group)
@@ -1,11 +1,13 @@
+from __future__ import annotations
+
 import random
 from typing import List
 
 from pydantic import BaseModel, Field
 
 import engine.events as events
-from engine.events import ACTION_EVENTS
 from engine.models import Player
+from engine.models.actor_index import ActorIndex
 from engine.roles.actor import Actor, Mafia
 
 # from engine.roles import Actor
@@ -18,31 +20,33 @@ class GodfatherSettings(BaseModel):
 
 
 class Godfather(Mafia):
+    settings_model = GodfatherSettings
+
+    __slots__ = ("settings",)
+
     def __init__(self, player: Player, settings: dict = dict()):
         super().__init__(player)
-        self.settings = GodfatherSettings.model_validate(settings)
+        self.settings = self.parse_settings(settings)
         self.night_immune = self.settings.night_immune
 
-    def find_possible_targets(self, actors: List[Actor] = None) -> None:
-        # Number of targets
-        num_targets = 1
-        self.possible_targets = []
-        for i in range(num_targets):
-            self.possible_targets.insert(
-                i,
-                [
-                    actor
-                    for actor in actors
-                    if actor.alive
-                    and actor.alignment != self.alignment
-                    and actor != self
-                ],
-            )
+    def new_night(self) -> None:
+        super().new_night()
+        self.night_immune = self.settings.night_immune
+
+    def find_possible_targets(self, actors: ActorIndex | List[Actor]) -> None:
+        index = ActorIndex.of(actors)
+        # Anyone alive outside of the Mafia
+        self.possible_targets = [
+            index.alive_mask & ~index.alignment_mask(self.alignment) & ~self.bit
+        ]
 
     def action(self):
         target = self.targets[0]
 
         def success():
+            if not self.events.recording:
+                return
+
             success_event_group = events.GameEventGroup(
                 group_id="godfather_action_success", duration=events.Duration.MAFIA_KILL
             )
@@ -52,7 +56,7 @@ class Godfather(Mafia):
                 events.GameEvent(
                     event_id="godfather_kill_success",
                     targets=["*"],
-                    message="There are sounds of shots in the streets",
+                    template="shots_in_the_streets",
                 )
             )
 
@@ -61,44 +65,48 @@ class Godfather(Mafia):
                 events.GameEvent(
                     event_id=events.Common.KILLED_BY_MAFIA,
                     targets=[target.player.id],
-                    message="You were killed by a member of the Mafia",
+                    template="killed_by_mafia",
                 )
             )
 
-            ACTION_EVENTS.new_event_group(success_event_group)
+            self.events.new_event_group(success_event_group)
 
         def fail():
-            print("Target survived")
+            logger.info("%s's target survived", self)
+            if not self.events.recording:
+                return
+
             fail_event_group = events.GameEventGroup(
                 group_id="godfather_action_fail", duration=events.Duration.MAFIA_KILL
             )
 
             # Inform all players that a Mafia kill has failed
             fail_event_group.new_event(
-                events.GameEvent(
-                    event_id="godfather_kill_fail", targets=["*"], message=""
-                )
+                events.GameEvent(event_id="godfather_kill_fail", targets=["*"])
             )
 
-            ACTION_EVENTS.new_event_group(fail_event_group)
+            self.events.new_event_group(fail_event_group)
 
         # Check if there are idle Mafioso that you can send, else go yourself
         proxies = [ally for ally in self.allies if isinstance(ally, Mafioso)]
         if not proxies:
             self.kill(target, success, fail)
         else:
-            proxy = random.choice(proxies)
+            proxy = (self.rng or random).choice(proxies)
             # TODO: If not target.witched
             proxy.targets = self.targets
+            logger.info("%s has chosen %s to act as a proxy", self, proxy)
+
+            if not self.events.recording:
+                return
 
             proxy_event_group = events.GameEventGroup(group_id="godfather_proxy")
             proxy_event_group.new_event(
                 events.GameEvent(
                     event_id="godfather_proxy_choice",
                     targets=[ally.player.id for ally in self.allies],
-                    message=f"The Godfather has chosed {proxy.alias} to carry out the hit",
+                    template="godfather_proxy",
+                    params={"alias": proxy.alias},
                 )
             )
-
-            logger.info(f"{self} has chosen {proxy} to act as a proxy")
-            ACTION_EVENTS.new_event_group(proxy_event_group)
+            self.events.new_event_group(proxy_event_group)
@@ -1,36 +1,28 @@
+from __future__ import annotations
+
 from typing import List
 
 import engine.events as events
-from engine.events import ACTION_EVENTS
 from engine.models import Player
+from engine.models.actor_index import ActorIndex
 from engine.roles.actor import Actor, Mafia
 
 
 class Mafioso(Mafia):
     tags = ["any_random", "mafia_random", "mafia_killing"]
 
+    __slots__ = ()
+
     def __init__(self, player: Player, settings: dict = dict()):
         super().__init__(player)
         # self.role_name = 'MafiosoTest'
 
-    def find_possible_targets(self, actors: List[Actor] = None) -> List[Actor]:
-        # Number of targets
-        num_targets = 1
-
-        self.possible_targets = []
-        for i in range(num_targets):
-            self.possible_targets.insert(
-                i,
-                {
-                    actor
-                    for actor in actors
-                    if actor.alive
-                    and actor.alignment != self.alignment
-                    and actor.number
-                    != self.number  # Seems a bit redundant, but can't hurt
-                },
-            )
-
+    def find_possible_targets(self, actors: ActorIndex | List[Actor]) -> List[int]:
+        index = ActorIndex.of(actors)
+        # Anyone alive outside of the Mafia
+        self.possible_targets = [
+            index.alive_mask & ~index.alignment_mask(self.alignment) & ~self.bit
+        ]
         return self.possible_targets
 
     def action(self):
@@ -42,6 +34,9 @@ class Mafioso(Mafia):
             brother.clear_targets()
 
         def success():
+            if not self.events.recording:
+                return
+
             success_event_group = events.GameEventGroup(
                 group_id="mafioso_action_success", duration=events.Duration.MAFIA_KILL
             )
@@ -51,7 +46,7 @@ class Mafioso(Mafia):
                 events.GameEvent(
                     event_id="mafia_kill_success",
                     targets=["*"],
-                    message="There are sounds of shots in the streets",
+                    template="shots_in_the_streets",
                 )
             )
 
@@ -60,22 +55,25 @@ class Mafioso(Mafia):
                 events.GameEvent(
                     event_id=events.Common.KILLED_BY_MAFIA,
                     targets=[target.player.id],
-                    message="You were killed by a member of the Mafia",
+                    template="killed_by_mafia",
                 )
             )
 
-            ACTION_EVENTS.new_event_group(success_event_group)
+            self.events.new_event_group(success_event_group)
 
         def fail():
+            if not self.events.recording:
+                return
+
             fail_event_group = events.GameEventGroup(
                 group_id="mafioso_action_fail", duration=events.Duration.MAFIA_KILL
             )
 
             # Inform all players that a Mafia kill has failed
             fail_event_group.new_event(
-                events.GameEvent(event_id="mafia_kill_fail", targets=["*"], message="")
+                events.GameEvent(event_id="mafia_kill_fail", targets=["*"])
             )
 
-            ACTION_EVENTS.new_event_group(fail_event_group)
+            self.events.new_event_group(fail_event_group)
 
         self.kill(target, success, fail)
@@ -0,0 +1,88 @@
+import importlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Tuple, Type
+
+from engine.roles.actor import Actor, Alignment
+
+
+@dataclass(frozen=True)
+class RoleSpec:
+    """
+    Everything the engine needs to know about a role without importing it.
+
+    :priority is the role's place in the night's turn order, lowest first.
+    :id is the role's number in binary snapshots and must never be reused.
+    The role's class is only imported the first time it is asked for.
+    """
+
+    id: int
+    name: str
+    module: str
+    tags: Tuple[str, ...]
+    alignment: Alignment
+    priority: int
+
+    @cached_property
+    def role_class(self) -> Type[Actor]:
+        return getattr(importlib.import_module(self.module), self.name)
+
+
+# Listed in turn order
+ROLE_SPECS: List[RoleSpec] = [
+    # ---   Role Blocking       --- #
+    # ---   Self Protecting     --- #
+    RoleSpec(
+        id=1,
+        name="Citizen",
+        module="engine.roles.citizen",
+        tags=("any_random", "town_random", "town_government"),
+        alignment=Alignment.TOWN,
+        priority=20,
+    ),
+    # ---   Target Protecting   --- #
+    RoleSpec(
+        id=2,
+        name="Doctor",
+        module="engine.roles.doctor",
+        tags=("any_random", "town_random", "town_protective"),
+        alignment=Alignment.TOWN,
+        priority=30,
+    ),
+    RoleSpec(
+        id=3,
+        name="Bodyguard",
+        module="engine.roles.bodyguard",
+        tags=("any_random", "town_random", "town_protective", "town_killing"),
+        alignment=Alignment.TOWN,
+        priority=31,
+    ),
+    # ---   Killing             --- #
+    RoleSpec(
+        id=4,
+        name="Godfather",
+        module="engine.roles.godfather",
+        tags=("any_random",),
+        alignment=Alignment.MAFIA,
+        priority=40,
+    ),
+    RoleSpec(
+        id=5,
+        name="Mafioso",
+        module="engine.roles.mafioso",
+        tags=("any_random", "mafia_random", "mafia_killing"),
+        alignment=Alignment.MAFIA,
+        priority=41,
+    ),
+    # ---   Investigative       --- #
+]
+
+ROLES: Dict[str, RoleSpec] = {spec.name: spec for spec in ROLE_SPECS}
+ROLES_BY_ID: Dict[int, RoleSpec] = {spec.id: spec for spec in ROLE_SPECS}
+
+
+def get_role(name: str) -> RoleSpec:
+    try:
+        return ROLES[name]
+    except KeyError:
+        raise ValueError(f"Unknown role '{name}'") from None
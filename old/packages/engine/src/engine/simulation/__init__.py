@@ -0,0 +1,9 @@
+from engine.simulation.bots import Bot, bot_lynch, bot_targets, tally  # noqa: F401
+from engine.simulation.policies import (  # noqa: F401
+    no_lynch,
+    no_targets,
+    random_lynch,
+    random_targets,
+)
+from engine.simulation.report import SimulationReport, WinRate  # noqa: F401
+from engine.simulation.simulator import headless, play_game, simulate  # noqa: F401
@@ -0,0 +1,86 @@
+"""
+Bots that play from what a client sees.
+
+A bot only looks at its own actor's dump (Actor.dump_state) and the public
+game state (GameState), which is the same data the web client gets. Load
+generated by bots therefore goes through the same paths as real players.
+bot_targets and bot_lynch wrap them as simulation policies.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from engine.models import Game
+from engine.roles import Actor
+
+
+@dataclass
+class Bot:
+    """
+    :activity - Chance of acting at night and of voting during the day,
+                the rest of the time the bot idles like an AFK player
+    """
+
+    rng: random.Random = field(default_factory=random.Random)
+    activity: float = 0.9
+
+    def allies(self, actor: dict) -> set:
+        return {ally["number"] for ally in actor["allies"]} | {actor["number"]}
+
+    def choose_targets(self, actor: dict) -> List[int]:
+        """Numbers to target tonight, one per list of possible targets"""
+        if not actor["alive"] or self.rng.random() >= self.activity:
+            return []
+
+        allies = self.allies(actor)
+        targets = []
+        for options in actor["possibleTargets"]:
+            if not options:
+                return []
+            # Stay away from allies whenever there is someone else to pick
+            others = [number for number in options if number not in allies]
+            targets.append(self.rng.choice(others or options))
+        return targets
+
+    def choose_vote(self, actor: dict, state: dict) -> Optional[int]:
+        """Who to vote to lynch, never an ally. None abstains"""
+        if not actor["alive"] or self.rng.random() >= self.activity:
+            return None
+
+        allies = self.allies(actor)
+        candidates = [
+            player["number"]
+            for player in state["players"]
+            if player["alive"] and player["number"] not in allies
+        ]
+        return self.rng.choice(candidates) if candidates else None
+
+
+def tally(votes: Dict[int, Optional[int]], voters: int) -> Optional[int]:
+    """The number voted for by a majority of :voters, if anyone was"""
+    counts = Counter(vote for vote in votes.values() if vote is not None)
+    if not counts:
+        return None
+    number, count = counts.most_common(1)[0]
+    return number if count > voters // 2 else None
+
+
+def bot_targets(actor: Actor, game: Game, rng: random.Random) -> List[Actor]:
+    """Target policy that plays every actor as a Bot"""
+    numbers = Bot(rng).choose_targets(actor.dump_state())
+    return [game.get_actor_by_number(number) for number in numbers]
+
+
+def bot_lynch(game: Game, rng: random.Random) -> Optional[int]:
+    """Lynch policy where every living actor votes as a Bot"""
+    bot = Bot(rng)
+    state = game.dump_state()
+    alive = game.alive_actors
+    votes = {
+        actor.number: bot.choose_vote(actor.dump_state(), state) for actor in alive
+    }
+    return tally(votes, len(alive))
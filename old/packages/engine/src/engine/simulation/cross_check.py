@@ -0,0 +1,144 @@
+"""
+Holds the NumPy night kernel to the object engine.
+
+The same seeded games are played on both. The first night is replayed with
+identical targets, and every game whose outcome doesn't hinge on the
+Godfather's proxy pick (the only roll in a night) has to end the same. Later
+nights are played independently on each side with random targets, and the
+share of each role left alive is compared.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from engine.models import Game, GameConfig
+from engine.roles import ROLES_BY_ID
+from engine.simulation.kernel import GODFATHER, MAFIOSO, NO_TARGET, NightBatch
+from engine.simulation.policies import random_targets
+from engine.simulation.report import WinRate
+from engine.simulation.simulator import headless, simulated_players
+
+
+@dataclass
+class CrossCheck:
+    """
+    :replayed   - Games whose first night had to match exactly
+    :mismatched - Numbers of the replayed games that didn't
+    :engine     - Share of each role alive after the last night, object engine
+    :kernel     - The same from the kernel
+    """
+
+    games: int = 0
+    nights: int = 0
+    replayed: int = 0
+    mismatched: List[int] = field(default_factory=list)
+    engine: Dict[str, WinRate] = field(default_factory=dict)
+    kernel: Dict[str, WinRate] = field(default_factory=dict)
+
+    def gap(self, role: str) -> float:
+        """Two proportion z-score of the role's survival on either side"""
+        engine, kernel = self.engine[role], self.kernel[role]
+        pooled = (engine.wins + kernel.wins) / (engine.total + kernel.total)
+        variance = pooled * (1 - pooled) * (1 / engine.total + 1 / kernel.total)
+        if not variance:
+            return 0.0
+        return abs(engine.rate - kernel.rate) / math.sqrt(variance)
+
+    def consistent(self, z: float = 4.0) -> bool:
+        return not self.mismatched and all(self.gap(role) <= z for role in self.engine)
+
+    def dump(self) -> dict:
+        return {
+            "games": self.games,
+            "nights": self.nights,
+            "replayed": self.replayed,
+            "mismatched": self.mismatched,
+            "roles": {
+                role: {
+                    "engine": self.engine[role].dump(),
+                    "kernel": self.kernel[role].dump(),
+                    "gap": self.gap(role),
+                }
+                for role in sorted(self.engine)
+            },
+        }
+
+
+def _set_targets(game: Game, targets: np.ndarray) -> None:
+    game.generate_allies_and_possible_targets()
+    for actor in game.actors:
+        seat = targets[actor.number - 1]
+        actor.set_targets(
+            [] if seat == NO_TARGET else [game.get_actor_by_number(int(seat) + 1)]
+        )
+
+
+def _survival(games: List[Game]) -> Dict[str, WinRate]:
+    survival: Dict[str, WinRate] = {}
+    for game in games:
+        for actor in game.actors:
+            survival.setdefault(actor.role_name, WinRate()).add(actor.alive)
+    return survival
+
+
+def cross_check(
+    config: GameConfig,
+    games: int = 1000,
+    players: Optional[int] = None,
+    nights: int = 3,
+    seed: int = 0,
+) -> CrossCheck:
+    """
+    Play :games seeded games of :config for :nights nights (no lynches) on
+    the object engine and the kernel, and compare the outcomes.
+    """
+    players = players or len(config.tags)
+    rng = np.random.default_rng(seed)
+    report = CrossCheck(games=games, nights=nights)
+
+    with headless():
+        played = []
+        for i in range(games):
+            game = Game.new(simulated_players(players), config, seed=seed + i)
+            game.collector.recording = False
+            played.append(game)
+        batch = NightBatch.from_games(played)
+
+        # Night one, same targets on both sides
+        targets = batch.random_targets(rng)
+        proxy_pick = ((batch.role == MAFIOSO).sum(axis=1) > 1) & (
+            batch.role == GODFATHER
+        ).any(axis=1)
+        batch.resolve(targets, rng)
+        for row, game in enumerate(played):
+            _set_targets(game, targets[row])
+            game.resolve()
+            if proxy_pick[row]:
+                continue
+            report.replayed += 1
+            alive = [bool(batch.alive[row, actor.number - 1]) for actor in game.actors]
+            if alive != [actor.alive for actor in game.actors]:
+                report.mismatched.append(row)
+
+        # The rest independently
+        for row, game in enumerate(played):
+            policy = random.Random(f"policy:{seed + row}")
+            for _ in range(nights - 1):
+                game.generate_allies_and_possible_targets()
+                for actor in game.alive_actors:
+                    actor.set_targets(random_targets(actor, game, policy))
+                game.resolve()
+        for _ in range(nights - 1):
+            batch.resolve(batch.random_targets(rng), rng)
+
+    report.engine = _survival(played)
+    for row, seat in zip(*np.nonzero(batch.role)):
+        name = ROLES_BY_ID[int(batch.role[row, seat])].name
+        report.kernel.setdefault(name, WinRate()).add(bool(batch.alive[row, seat]))
+    return report
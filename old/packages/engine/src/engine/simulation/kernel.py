@@ -0,0 +1,215 @@
+"""
+Struct-of-arrays night kernel for simulating many games at once.
+
+A NightBatch holds N games as (N, seats) NumPy arrays, seat i being player
+number i + 1, and resolves a night for all of them with vectorised operations
+instead of stepping through Actor objects. It follows Game.resolve for the
+roles it knows (Citizen, Doctor, Bodyguard, Godfather, Mafioso), down to the
+quirks: the first living Mafioso with a target makes the only kill, a
+Godfather with Mafioso allies always sends one of them (dead or alive), and
+shootout deaths can be prevented by a doctor like any other.
+
+There are no events, logs or graveyard, only who is left alive. NumPy is an
+optional dependency (the "simulation" extra), so this module isn't imported
+by engine.simulation. See engine.simulation.cross_check for the harness that
+holds it to the object engine.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+try:
+    import numpy as np
+except ImportError as error:  # pragma: no cover
+    raise ImportError(
+        "The simulation kernel needs NumPy, install engine[simulation]"
+    ) from error
+
+from engine.models import Game
+from engine.roles import ROLES
+from engine.roles.actor import Alignment
+
+CITIZEN = ROLES["Citizen"].id
+DOCTOR = ROLES["Doctor"].id
+BODYGUARD = ROLES["Bodyguard"].id
+GODFATHER = ROLES["Godfather"].id
+MAFIOSO = ROLES["Mafioso"].id
+KERNEL_ROLES = ("Citizen", "Doctor", "Bodyguard", "Godfather", "Mafioso")
+
+# Role id -> alignment code, 0 is an empty seat
+NONE, TOWN, MAFIA = 0, 1, 2
+ALIGNMENT = np.zeros(max(ROLES[role].id for role in KERNEL_ROLES) + 1, np.int8)
+for _role in KERNEL_ROLES:
+    ALIGNMENT[ROLES[_role].id] = {Alignment.TOWN: TOWN, Alignment.MAFIA: MAFIA}[
+        ROLES[_role].alignment
+    ]
+
+NO_TARGET = -1
+
+
+@dataclass
+class NightBatch:
+    """
+    N games, one row each.
+
+    :role   - Role id per seat, 0 for seats past the game's player count
+    :alive  - Whether the seat's player is alive
+    :vests  - Citizens' remaining vests, 0 for everyone else
+    :day    - Each game's day, incremented by every resolve
+    """
+
+    role: np.ndarray
+    alive: np.ndarray
+    vests: np.ndarray
+    day: np.ndarray
+
+    @classmethod
+    def from_games(cls, games: List[Game]) -> NightBatch:
+        """Copy the state of :games, their targets are left behind"""
+        seats = max(len(game.actors) for game in games)
+        batch = cls(
+            role=np.zeros((len(games), seats), np.int8),
+            alive=np.zeros((len(games), seats), bool),
+            vests=np.zeros((len(games), seats), np.int16),
+            day=np.array([game.day for game in games], np.int32),
+        )
+
+        for row, game in enumerate(games):
+            for actor in game.actors:
+                if actor.role_name not in KERNEL_ROLES:
+                    raise ValueError(f"The kernel can't play {actor.role_name}")
+                seat = actor.number - 1
+                batch.role[row, seat] = ROLES[actor.role_name].id
+                batch.alive[row, seat] = actor.alive
+                batch.vests[row, seat] = getattr(actor, "remaining_vests", 0)
+
+        if ((batch.role == GODFATHER).sum(axis=1) > 1).any():
+            raise ValueError("The kernel plays at most one Godfather per game")
+        return batch
+
+    @property
+    def games(self) -> int:
+        return self.role.shape[0]
+
+    @property
+    def seats(self) -> int:
+        return self.role.shape[1]
+
+    @property
+    def alignment(self) -> np.ndarray:
+        return ALIGNMENT[self.role]
+
+    def possible_targets(self) -> np.ndarray:
+        """
+        (N, seats, seats) mask of who each seat may target tonight, matching
+        each role's find_possible_targets. The dead target no one.
+        """
+        alive = self.alive
+        role = self.role[:, :, None]
+        others = alive[:, None, :] & ~np.eye(self.seats, dtype=bool)[None]
+
+        citizen = np.eye(self.seats, dtype=bool)[None] & (self.vests > 0)[:, :, None]
+        mafia = others & (self.alignment != MAFIA)[:, None, :]
+        legal = np.where(
+            role == CITIZEN,
+            citizen,
+            np.where(
+                (role == DOCTOR) | (role == BODYGUARD),
+                others,
+                np.where((role == GODFATHER) | (role == MAFIOSO), mafia, False),
+            ),
+        )
+        return legal & alive[:, :, None]
+
+    def random_targets(self, rng: np.random.Generator) -> np.ndarray:
+        """
+        Seat each seat targets, or NO_TARGET. Like policies.random_targets,
+        everyone acts and picks uniformly from their possible targets.
+        """
+        legal = self.possible_targets()
+        # The largest of uniform draws over the legal seats is a uniform pick
+        scores = rng.random(legal.shape) * legal
+        targets = scores.argmax(axis=2).astype(np.int16)
+        targets[~legal.any(axis=2)] = NO_TARGET
+        return targets
+
+    def resolve(self, targets: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Resolve a night for every game from the seats in :targets, returns
+        the (N, seats) mask of who died. Invalid targets are ignored the way
+        Game.resolve clears them.
+        """
+        n, seats = self.role.shape
+        rows = np.arange(n)
+        role, alive = self.role, self.alive
+        self.day += 1
+
+        # Drop anything outside the possible targets
+        has_target = targets >= 0
+        target = np.where(has_target, targets, 0).astype(np.intp)
+        legal = np.take_along_axis(self.possible_targets(), target[:, :, None], 2)
+        acting = has_target & legal[:, :, 0]
+
+        # Citizens vest themselves
+        vested = acting & (role == CITIZEN)
+        self.vests -= vested
+        immune = vested
+
+        # Doctors and bodyguards per target seat. The first bodyguard to act,
+        # the lowest seat, is the one in the shootout
+        flat = rows[:, None] * seats + target
+        doctors = np.bincount(
+            flat[acting & (role == DOCTOR)], minlength=n * seats
+        ).reshape(n, seats)
+        guarding = acting & (role == BODYGUARD)
+        bodyguard = np.full(n * seats, seats, np.intp)
+        np.minimum.at(bodyguard, flat[guarding], np.nonzero(guarding)[1])
+        bodyguard = bodyguard.reshape(n, seats)
+
+        # The Godfather hands his target to a random Mafioso, dead or alive,
+        # or goes himself when there are none
+        mafioso = role == MAFIOSO
+        mafiosi = mafioso.sum(axis=1)
+        godfather = acting & (role == GODFATHER)
+        has_godfather = godfather.any(axis=1)
+        godfather_seat = godfather.argmax(axis=1)
+        godfather_target = target[rows, godfather_seat]
+
+        hit = np.where(acting & mafioso, target, NO_TARGET)
+        sends = has_godfather & (mafiosi > 0)
+        pick = (rng.random(n) * mafiosi).astype(np.intp)
+        proxy = (np.cumsum(mafioso, axis=1) > pick[:, None]).argmax(axis=1)
+        hit[rows[sends], proxy[sends]] = godfather_target[sends]
+
+        # Only the first living Mafioso with a target shoots, he clears the rest
+        shooting = (hit >= 0) & alive
+        has_shooter = shooting.any(axis=1)
+        shooter = shooting.argmax(axis=1)
+        killer = np.where(
+            has_shooter,
+            shooter,
+            np.where(has_godfather & (mafiosi == 0), godfather_seat, NO_TARGET),
+        )
+        victim = np.where(has_shooter, hit[rows, shooter], godfather_target)
+
+        # Actor.kill: bodyguards first, then night immunity, then a death.
+        # Every death here is one a doctor on the dying seat prevents
+        attack = killer >= 0
+        victim = np.where(attack, victim, 0)
+        guard = bodyguard[rows, victim]
+        shootout = attack & (guard < seats)
+        killed = attack & ~shootout & ~immune[rows, victim]
+
+        died = np.zeros((n, seats), bool)
+        for mask, seat in (
+            (shootout, guard),
+            (shootout, np.where(attack, killer, 0)),
+            (killed, victim),
+        ):
+            game, seat = rows[mask], seat[mask]
+            died[game, seat] = doctors[game, seat] == 0
+
+        self.alive &= ~died
+        return died
@@ -0,0 +1,43 @@
+"""
+Decision making for simulated players.
+
+A target policy is called for every alive actor at the start of each night and
+returns the actors it targets (one per list of possible targets, or nothing).
+A lynch policy is called once per day and returns the number of the player to
+lynch, or None to skip the lynch. Policies must be module level functions so
+they can be sent to the worker processes.
+"""
+
+from random import Random
+from typing import List, Optional
+
+from engine.models import Game
+from engine.roles import Actor
+from engine.utils.bitset import numbers_of
+
+
+def random_targets(actor: Actor, game: Game, rng: Random) -> List[Actor]:
+    """Always act, picking uniformly from each list of possible targets"""
+    targets = []
+    for mask in actor.possible_targets:
+        options = numbers_of(mask)
+        if not options:
+            return []
+        targets.append(game.get_actor_by_number(rng.choice(options)))
+    return targets
+
+
+def no_targets(actor: Actor, game: Game, rng: Random) -> List[Actor]:
+    return []
+
+
+def random_lynch(game: Game, rng: Random) -> Optional[int]:
+    """Lynch a uniformly random living player"""
+    alive = game.alive_actors
+    if not alive:
+        return None
+    return rng.choice(alive).number
+
+
+def no_lynch(game: Game, rng: Random) -> Optional[int]:
+    return None
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+
+@dataclass
+class WinRate:
+    wins: int = 0
+    total: int = 0
+
+    @property
+    def rate(self) -> float:
+        return self.wins / self.total if self.total else 0.0
+
+    def interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """Wilson score interval, defaults to 95% confidence"""
+        if not self.total:
+            return 0.0, 0.0
+
+        n = self.total
+        p = self.wins / n
+        denominator = 1 + z**2 / n
+        centre = (p + z**2 / (2 * n)) / denominator
+        spread = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+        return max(0.0, centre - spread), min(1.0, centre + spread)
+
+    def add(self, won: bool) -> None:
+        self.wins += int(won)
+        self.total += 1
+
+    def merge(self, other: WinRate) -> None:
+        self.wins += other.wins
+        self.total += other.total
+
+    def dump(self) -> dict:
+        low, high = self.interval()
+        return {
+            "wins": self.wins,
+            "total": self.total,
+            "rate": self.rate,
+            "interval": [low, high],
+        }
+
+
+@dataclass
+class SimulationReport:
+    """
+    Win rates gathered over a batch of simulated games.
+
+    :roles      - Share of actors holding each role that ended up winning
+    :alignments - Share of games containing each alignment that it won
+    :draws      - Games that hit the day limit without a winner
+    """
+
+    games: int = 0
+    draws: int = 0
+    days: int = 0
+    roles: Dict[str, WinRate] = field(default_factory=dict)
+    alignments: Dict[str, WinRate] = field(default_factory=dict)
+
+    @property
+    def average_days(self) -> float:
+        return self.days / self.games if self.games else 0.0
+
+    def merge(self, other: SimulationReport) -> SimulationReport:
+        self.games += other.games
+        self.draws += other.draws
+        self.days += other.days
+        for key, rates in (("roles", other.roles), ("alignments", other.alignments)):
+            mine = getattr(self, key)
+            for name, rate in rates.items():
+                mine.setdefault(name, WinRate()).merge(rate)
+        return self
+
+    def dump(self) -> dict:
+        return {
+            "games": self.games,
+            "draws": self.draws,
+            "averageDays": self.average_days,
+            "roles": {name: rate.dump() for name, rate in sorted(self.roles.items())},
+            "alignments": {
+                name: rate.dump() for name, rate in sorted(self.alignments.items())
+            },
+        }
@@ -0,0 +1,166 @@
+import random
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Callable, List, Optional, Tuple
+
+from engine.models import Game, GameConfig, Player
+from engine.roles import Actor
+from engine.simulation.policies import random_lynch, random_targets
+from engine.simulation.report import SimulationReport, WinRate
+from engine.utils import process_map
+from engine.utils.logging import logger
+
+TargetPolicy = Callable[[Actor, Game, random.Random], List[Actor]]
+LynchPolicy = Callable[[Game, random.Random], Optional[int]]
+
+
+_headless_lock = threading.Lock()
+_headless = 0
+_restore_disabled = False
+
+
+@contextmanager
+def headless():
+    """
+    Silence the engine's logger while simulating. Other loggers are left
+    alone, and overlapping calls (from threads too) restore it once the last
+    one exits.
+    """
+    global _headless, _restore_disabled
+
+    with _headless_lock:
+        if _headless == 0:
+            _restore_disabled = logger.disabled
+        _headless += 1
+        logger.disabled = True
+    try:
+        yield
+    finally:
+        with _headless_lock:
+            _headless -= 1
+            if _headless == 0:
+                logger.disabled = _restore_disabled
+
+
+def simulated_players(n: int) -> List[Player]:
+    return [
+        Player(id=f"sim-{i}", name=f"Sim{i}", alias=f"Sim{i}") for i in range(1, n + 1)
+    ]
+
+
+def play_game(
+    config: GameConfig,
+    players: int,
+    seed: int,
+    target_policy: TargetPolicy = random_targets,
+    lynch_policy: LynchPolicy = random_lynch,
+    max_days: int = 30,
+    record_events: bool = False,
+) -> Tuple[Game, Optional[List[Actor]]]:
+    """Play a single game to completion, returns the game and its winners"""
+    # Policies get their own stream so they don't shift the engine's rolls
+    rng = random.Random(f"policy:{seed}")
+
+    game = Game.new(simulated_players(players), config, seed=seed)
+    game.collector.recording = record_events
+
+    while game.day <= max_days:
+        # Night
+        game.generate_allies_and_possible_targets()
+        for actor in game.alive_actors:
+            actor.set_targets(target_policy(actor, game, rng))
+
+        game.resolve()
+        winners = game.check_for_win()
+        if winners:
+            return game, winners
+
+        # Day
+        number = lynch_policy(game, rng)
+        if number is not None:
+            game.lynch(number)
+            winners = game.check_for_win()
+            if winners:
+                return game, winners
+
+    return game, None
+
+
+def record_game(
+    report: SimulationReport, game: Game, winners: Optional[List[Actor]]
+) -> None:
+    report.games += 1
+    report.days += game.day
+    if not winners:
+        report.draws += 1
+
+    winning = {winner.number for winner in winners or []}
+    alignments = {}
+    for actor in game.actors:
+        won = actor.number in winning
+        report.roles.setdefault(actor.role_name, WinRate()).add(won)
+        alignment = actor.alignment.value
+        alignments[alignment] = alignments.get(alignment, False) or won
+
+    for alignment, won in alignments.items():
+        report.alignments.setdefault(alignment, WinRate()).add(won)
+
+
+def _simulate_chunk(job: tuple) -> SimulationReport:
+    config, players, seeds, target_policy, lynch_policy, max_days, quiet = job
+
+    report = SimulationReport()
+    with headless() if quiet else nullcontext():
+        for seed in seeds:
+            game, winners = play_game(
+                config,
+                players,
+                seed,
+                target_policy=target_policy,
+                lynch_policy=lynch_policy,
+                max_days=max_days,
+                record_events=not quiet,
+            )
+            record_game(report, game, winners)
+
+    return report
+
+
+def simulate(
+    config: GameConfig,
+    games: int = 1000,
+    players: Optional[int] = None,
+    seed: int = 0,
+    target_policy: TargetPolicy = random_targets,
+    lynch_policy: LynchPolicy = random_lynch,
+    max_days: int = 30,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    quiet: bool = True,
+) -> SimulationReport:
+    """
+    Play :games seeded games of :config and report how often each role and
+    alignment wins.
+
+    Game i is seeded with :seed + i, so a report only depends on its inputs and
+    not on how the games were spread across the :workers processes. With
+    :quiet (the default) games run headless, without engine logging or events.
+    """
+    players = players or len(config.tags)
+    jobs = [
+        (
+            config,
+            players,
+            range(start, min(start + chunk_size, seed + games)),
+            target_policy,
+            lynch_policy,
+            max_days,
+            quiet,
+        )
+        for start in range(seed, seed + games, chunk_size)
+    ]
+
+    report = SimulationReport()
+    for chunk in process_map(_simulate_chunk, jobs, max_workers=workers):
+        report.merge(chunk)
+    return report
@@ -0,0 +1,219 @@
+"""
+Compact, versioned binary snapshots of a whole Game.
+
+A snapshot holds what dump_state and dump_actors would, minus anything the
+engine can derive again on load (allies, the config's settings). The config
+is referenced by its content hash and has to be supplied when loading.
+
+Layout (big endian), version 2:
+
+    header      magic "MAFS", version u8, config key (32 bytes), day u16,
+                seed i64, player count u16, alive mask (bitset)
+    player      number u16, role id u8, id/name/alias str,
+                targets (count u8 + u16 numbers),
+                possible targets (count u8 + bitsets),
+                role actions (JSON str, empty when there are none)
+    graveyard   count u16, then per record number u16, role id u8, dod u16,
+                alias/cod/will str
+
+Strings are a u16 byte length followed by UTF-8, bitsets a u16 byte length
+followed by the unsigned integer. Version 1 used u8 player numbers and counts
+and fixed u16 bitsets, which capped games at 15 players; it can still be read.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import TYPE_CHECKING, List, Tuple
+
+from engine.models.compiled_config import ConfigInput, compile_config
+from engine.roles import ROLES, ROLES_BY_ID
+
+if TYPE_CHECKING:
+    from engine.models import Game
+
+MAGIC = b"MAFS"
+VERSION = 2
+
+_PREFIX = struct.Struct("!4sB")
+_HEADER = {1: struct.Struct("!32sHqB"), 2: struct.Struct("!32sHqH")}
+_NUMBER = {1: struct.Struct("!B"), 2: struct.Struct("!H")}
+_U8 = struct.Struct("!B")
+_U16 = struct.Struct("!H")
+
+
+def _role_id(role: str) -> int:
+    return ROLES[role].id if role in ROLES else 0
+
+
+def _role_name(role_id: int) -> str:
+    return ROLES_BY_ID[role_id].name if role_id else None
+
+
+def _pack_str(value: str) -> bytes:
+    data = (value or "").encode()
+    return _U16.pack(len(data)) + data
+
+
+def _pack_mask(mask: int) -> bytes:
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "big")
+    return _U16.pack(len(data)) + data
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.offset = 0
+        self.version = VERSION
+
+    def unpack(self, fmt: struct.Struct) -> Tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def u8(self) -> int:
+        return self.unpack(_U8)[0]
+
+    def u16(self) -> int:
+        return self.unpack(_U16)[0]
+
+    def number(self) -> int:
+        return self.unpack(_NUMBER[self.version])[0]
+
+    def bytes(self, length: int) -> bytes:
+        if self.offset + length > len(self.data):
+            raise ValueError("Corrupt snapshot")
+        value = bytes(self.data[self.offset : self.offset + length])
+        self.offset += length
+        return value
+
+    def string(self) -> str:
+        return self.bytes(self.u16()).decode()
+
+    def mask(self) -> int:
+        if self.version == 1:
+            return self.u16()
+        return int.from_bytes(self.bytes(self.u16()), "big")
+
+
+def dump_snapshot(game: Game) -> bytes:
+    number = _NUMBER[VERSION]
+    parts: List[bytes] = [
+        _PREFIX.pack(MAGIC, VERSION),
+        _HEADER[VERSION].pack(
+            bytes.fromhex(game.compiled.key), game.day, game.seed, len(game.actors)
+        ),
+        _pack_mask(game.index.alive_mask),
+    ]
+
+    for actor in game.actors:
+        player = actor.player
+        role_actions = actor.dump_role_actions()
+        parts += [
+            number.pack(actor.number),
+            _U8.pack(_role_id(actor.role_name)),
+            _pack_str(player.id),
+            _pack_str(player.name),
+            _pack_str(actor.alias),
+            _U8.pack(len(actor.targets)),
+            b"".join(number.pack(target.number) for target in actor.targets),
+            _U8.pack(len(actor.possible_targets)),
+            b"".join(_pack_mask(mask) for mask in actor.possible_targets),
+            _pack_str(json.dumps(role_actions) if role_actions else ""),
+        ]
+
+    graveyard = game.graveyard
+    parts.append(number.pack(len(graveyard)))
+    for record in graveyard:
+        parts += [
+            number.pack(record["number"]),
+            _U8.pack(_role_id(record["role"])),
+            _U16.pack(record["dod"]),
+            _pack_str(record["alias"]),
+            _pack_str(record["cod"]),
+            _pack_str(record["will"]),
+        ]
+
+    return b"".join(parts)
+
+
+def read_snapshot(data: bytes) -> Tuple[str, List[dict], dict]:
+    """
+    Decode a snapshot into its config key, the actors' dumps and the state.
+    Anything that isn't a whole snapshot raises ValueError.
+    """
+    try:
+        return _read_snapshot(data)
+    except (struct.error, IndexError, KeyError) as error:
+        raise ValueError("Corrupt snapshot") from error
+
+
+def _read_snapshot(data: bytes) -> Tuple[str, List[dict], dict]:
+    reader = _Reader(data)
+    magic, version = reader.unpack(_PREFIX)
+    if magic != MAGIC:
+        raise ValueError("Not a game snapshot")
+    if version not in _HEADER:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    reader.version = version
+
+    key, day, seed, count = reader.unpack(_HEADER[version])
+    alive_mask = reader.mask()
+
+    players = []
+    for _ in range(count):
+        number = reader.number()
+        role_id = reader.u8()
+        player = {
+            "id": reader.string(),
+            "name": reader.string(),
+            "alias": reader.string(),
+            "role": _role_name(role_id),
+            "number": number,
+            "alive": bool(alive_mask >> number & 1),
+        }
+        player["targets"] = [reader.number() for _ in range(reader.u8())]
+        player["possibleTargets"] = [reader.mask() for _ in range(reader.u8())]
+        role_actions = reader.string()
+        player["roleActions"] = json.loads(role_actions) if role_actions else {}
+        players.append(player)
+
+    graveyard = []
+    for _ in range(reader.number()):
+        number = reader.number()
+        role_id = reader.u8()
+        dod = reader.u16()
+        graveyard.append(
+            {
+                "number": number,
+                "alias": reader.string(),
+                "cod": reader.string(),
+                "dod": dod,
+                "role": _role_name(role_id),
+                "will": reader.string(),
+            }
+        )
+
+    state = {
+        "day": day,
+        "seed": seed,
+        "players": [
+            {"number": p["number"], "alias": p["alias"], "alive": p["alive"]}
+            for p in players
+        ],
+        "graveyard": graveyard,
+    }
+    return key.hex(), players, state
+
+
+def load_snapshot(data: bytes, config: ConfigInput) -> Game:
+    """Rebuild a Game from a snapshot and the config it was taken with"""
+    from engine.models import Game
+
+    key, players, state = read_snapshot(data)
+    config = compile_config(config)
+    if key != config.key:
+        raise ValueError("Snapshot was taken with a different config")
+
+    return Game.load(players, config, state, trusted=True)
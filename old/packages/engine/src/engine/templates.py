@@ -0,0 +1,45 @@
+"""
+The text of every event, keyed by template id.
+
+Events only carry a template id and its parameters, clients render the text
+themselves from this catalogue. Parameters are filled in with str.format.
+Bump VERSION whenever a template is removed, reworded or takes different
+parameters, clients cache the catalogue by version. Ids are never reused.
+"""
+
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+VERSION = 1
+
+TEMPLATES: Mapping[str, str] = MappingProxyType(
+    {
+        # Broadcast
+        "shots_in_the_streets": "There are sounds of shots in the streets",
+        "shootout": "You hear sounds of a shootout",
+        # Mafia
+        "killed_by_mafia": "You were killed by a member of the Mafia",
+        "godfather_proxy": "The Godfather has chosen {alias} to carry out the hit",
+        # Bodyguard
+        "protected_by_bodyguard": "You were protected by a bodyguard",
+        "killed_by_bodyguard": "You were killed by the Bodyguard defending your target",
+        "died_defending": "You died defending your target",
+        # Doctor
+        "revived_target": "Your target was attacked last night, but you successfully revived them",
+        "revived_by_doctor": "You were revived by a doctor. Rock on",
+        # Common
+        "night_immune": "You were attacked tonight but survived due to Night Immunity",
+    }
+)
+
+
+def render(template: Optional[str], params: Optional[Mapping] = None) -> str:
+    """The text for :template, events without one have none"""
+    if template is None:
+        return ""
+    return TEMPLATES[template].format(**(params or {}))
+
+
+def catalogue() -> dict:
+    """Everything a client needs to render events, to ship alongside the engine"""
+    return {"version": VERSION, "templates": dict(TEMPLATES)}
@@ -1,4 +1,8 @@
 import importlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional
 
 
 def class_for_name(module_name, class_name):
@@ -11,3 +15,32 @@ def class_for_name(module_name, class_name):
     m = importlib.import_module(module_name)
     c = getattr(m, class_name)
     return c
+
+
+def process_map(
+    fn: Callable, items: Iterable, max_workers: Optional[int] = None
+) -> List:
+    """Map :fn over :items on a process pool, keeping the input order.
+
+    :fn must be a module level function so it can be pickled to the workers.
+    Falls back to running serially when only one worker is wanted or a pool
+    can't be created (eg. Lambda has no shared memory for multiprocessing)
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers == 1:
+        return [fn(item) for item in items]
+
+    workers = max_workers or os.cpu_count() or 1
+    # Batch the items so each worker round-trip carries more than one call
+    chunksize = max(1, len(items) // (workers * 4))
+
+    try:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError) as e:
+        logging.getLogger(__name__).warning(
+            "Process pool unavailable, running serially: %s", e
+        )
+        return [fn(item) for item in items]
+
+    with pool:
+        return list(pool.map(fn, items, chunksize=chunksize))
@@ -0,0 +1,27 @@
+"""
+Sets of player numbers packed into a single int, bit n set means player n is in
+the set. Player numbers start at 1 so bit 0 is never used.
+"""
+
+from typing import Iterable, List
+
+
+def bit(number: int) -> int:
+    return 1 << number
+
+
+def mask_of(numbers: Iterable[int]) -> int:
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+
+def numbers_of(mask: int) -> List[int]:
+    """The player numbers in :mask, lowest first"""
+    numbers = []
+    while mask:
+        low = mask & -mask
+        numbers.append(low.bit_length() - 1)
+        mask ^= low
+    return numbers
@@ -1,24 +1,97 @@
 import logging
-import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, List
 
-logger = logging
-logger.basicConfig(
-    filename="log.log",
-    level=logging.DEBUG,
-    format="[%(filename)-20s][%(funcName)-20s][%(levelname)-8s] %(message)s",
-    filemode="w",
-)
+FORMAT = "[%(filename)-20s][%(funcName)-20s][%(levelname)-8s] %(message)s"
+
+_local = threading.local()
+
+
+class _EngineLogger(logging.Logger):
+    """
+    Also enabled for whatever level the current thread is collecting at, so
+    a collect_logs never changes what other threads format and emit
+    """
+
+    def isEnabledFor(self, level: int) -> bool:
+        if self.disabled:
+            return False
+        collecting = getattr(_local, "level", None)
+        if collecting is not None and level >= collecting:
+            return True
+        return super().isEnabledFor(level)
+
+
+# The engine never configures logging or writes files of its own, callers
+# either attach handlers or collect records with collect_logs. The class is
+# swapped in place so a logger the host already made for "engine" is the one
+# used
+logger = logging.getLogger("engine")
+logger.__class__ = _EngineLogger
+logger.addHandler(logging.NullHandler())
+
+
+class LogCollector(logging.Handler):
+    """
+    Keeps the engine's log records for a single invocation in memory.
+
+    Only records from the thread that created the collector are kept, so games
+    resolving side by side don't mix their logs. The buffer holds the latest
+    :capacity records, and messages aren't formatted until dump is called.
+    """
+
+    def __init__(self, level: int = logging.INFO, capacity: int = 1000) -> None:
+        super().__init__(level)
+        self.thread = threading.get_ident()
+        self.records: deque = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread != self.thread:
+            return
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(record)
+
+    def dump(self) -> List[dict]:
+        return [
+            {
+                "level": record.levelname,
+                "function": record.funcName,
+                "message": record.getMessage(),
+            }
+            for record in self.records
+        ]
+
+
+@contextmanager
+def collect_logs(
+    level: int = logging.INFO, capacity: int = 1000
+) -> Iterator[LogCollector]:
+    """
+    Collect the engine's records at :level and above for the duration. Only
+    the calling thread logs at :level, the logger's own level is left alone
+    """
+    collector = LogCollector(level, capacity)
+    previous = getattr(_local, "level", None)
+    _local.level = level if previous is None else min(previous, level)
+    logger.addHandler(collector)
+    try:
+        yield collector
+    finally:
+        logger.removeHandler(collector)
+        _local.level = previous
 
 
 def log_to_terminal():
     """Attach a console handler to the logger if not already present."""
-    root_logger = logging.getLogger()
+    if any(isinstance(h, logging.StreamHandler) for h in logger.handlers):
+        return
 
-    # Add a new console handler
+    logger.setLevel(logging.DEBUG)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.DEBUG)  # Adjust level for console logging
-    console_formatter = logging.Formatter(
-        "[%(filename)-20s][%(funcName)-20s][%(levelname)-8s] %(message)s"
-    )
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(logging.Formatter(FORMAT))
+    logger.addHandler(console_handler)
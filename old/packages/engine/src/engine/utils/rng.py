@@ -0,0 +1,16 @@
+import random
+import secrets
+
+
+def new_seed() -> int:
+    return secrets.randbits(63)
+
+
+def reseed(rng: random.Random, seed: int, day: int) -> random.Random:
+    """Point :rng at the stream for :day of the game seeded with :seed.
+
+    Each day gets its own stream derived from the game seed, so replaying a
+    stage only needs the seed and the day rather than the full RNG state
+    """
+    rng.seed(f"{seed}:{day}")
+    return rng
@@ -0,0 +1,106 @@
+import logging
+
+from engine import models, roles
+from engine.models.actor_index import ActorIndex
+from engine.roles.actor import Alignment
+
+
+def bootstrap():
+    citizen = roles.Citizen(
+        models.Player(**{"name": "A", "alias": "test_citizen", "number": 1, "id": "1"})
+    )
+    doctor = roles.Doctor(
+        models.Player(**{"name": "B", "alias": "test_doctor", "number": 2, "id": "2"})
+    )
+    mafioso = roles.Mafioso(
+        models.Player(**{"name": "C", "alias": "test_mafioso", "number": 3, "id": "3"})
+    )
+    dead = roles.Citizen(
+        models.Player(
+            **{
+                "name": "D",
+                "alias": "test_dead",
+                "number": 4,
+                "id": "4",
+                "alive": False,
+            }
+        )
+    )
+
+    actors = [citizen, doctor, mafioso, dead]
+    index = ActorIndex(actors)
+    for actor in actors:
+        actor.index = index
+
+    return index, citizen, doctor, mafioso, dead
+
+
+def test_index_lookups():
+    logging.info("--- TEST: Index lookups ---")
+    index, citizen, doctor, mafioso, dead = bootstrap()
+
+    assert index.get(3) is mafioso
+    assert index.get(99) is None
+    assert index.alignment(Alignment.TOWN) == (citizen, doctor, dead)
+    assert index.alignment(Alignment.MAFIA) == (mafioso,)
+    assert index.alive_actors == (citizen, doctor, mafioso)
+    assert index.dead_actors == (dead,)
+
+
+def test_allies_share_the_index_tuple():
+    logging.info("--- TEST: Allies share the index tuple ---")
+    index, citizen, doctor, mafioso, dead = bootstrap()
+
+    mafioso.find_allies(index)
+
+    assert mafioso.allies is index.alignment(Alignment.MAFIA)
+    assert isinstance(mafioso.allies, tuple), "Allies must not edit the index"
+    assert index.by_alignment[Alignment.MAFIA] == [mafioso]
+
+
+def test_index_follows_deaths():
+    logging.info("--- TEST: Index follows deaths ---")
+    index, citizen, doctor, mafioso, dead = bootstrap()
+
+    mafioso.set_targets([citizen])
+    mafioso.do_action()
+
+    assert citizen not in index.alive_actors
+    assert index.dead_actors == (dead, citizen)
+
+    mafioso.lynched()
+    assert index.alive_actors == (doctor,)
+
+
+def test_index_ignores_revives():
+    logging.info("--- TEST: Index ignores revives ---")
+    index, citizen, doctor, mafioso, dead = bootstrap()
+    alive = index.alive_actors
+
+    doctor.set_targets([citizen])
+    doctor.do_action()
+    mafioso.set_targets([citizen])
+    mafioso.do_action()
+
+    assert citizen.alive
+    assert index.alive_actors is alive, "A revive should not touch the index"
+
+
+def test_index_counts_the_living():
+    logging.info("--- TEST: Index counts the living ---")
+    index, citizen, doctor, mafioso, dead = bootstrap()
+
+    assert index.alive_count() == 3
+    assert index.alive_count(Alignment.TOWN) == 2
+    assert index.alive_role_count("Citizen") == 1
+
+    citizen.lynched()
+    citizen.lynched()  # Dying twice only counts once
+    assert index.alive_count(Alignment.TOWN) == 1
+    assert index.alive_role_count("Citizen") == 0
+    assert not doctor.check_for_win(index)
+
+    mafioso.lynched()
+    assert index.alive_count() == 1
+    assert index.alive_count(Alignment.MAFIA) == 0
+    assert doctor.check_for_win(index)
@@ -0,0 +1,64 @@
+import json
+import logging
+import pickle
+
+from conftest import dummy_config, dummy_players
+from engine import Game
+from engine.models import compile_config
+from engine.roles.citizen import CitizenSettings
+from engine.roles.godfather import GodfatherSettings
+
+
+def test_compile_config():
+    logging.info("--- TEST: Compile config ---")
+    config = dummy_config()
+    compiled = compile_config(config)
+
+    assert compiled.config == config
+    assert isinstance(compiled.role_settings["Citizen"], CitizenSettings)
+    assert isinstance(compiled.role_settings["Godfather"], GodfatherSettings)
+    assert compiled.role_settings["Godfather"].night_immune
+    assert compiled.turn_order[0] == "Citizen"
+
+
+def test_compile_config_is_cached():
+    logging.info("--- TEST: Compiled configs are cached ---")
+    config = dummy_config()
+    compiled = compile_config(config)
+
+    # The same content in any of its forms is only compiled once
+    assert compile_config(dummy_config()) is compiled
+    assert compile_config(config.model_dump(mode="json")) is compiled
+    assert compile_config(compiled) is compiled
+
+    json_config = config.model_dump_json()
+    assert compile_config(json_config) is compile_config(json_config)
+
+    other = dummy_config(roles=["Citizen", "Doctor"])
+    assert compile_config(other) is not compiled
+
+
+def test_games_share_compiled_config():
+    logging.info("--- TEST: Games share a compiled config ---")
+    config = dummy_config()
+    game_1 = Game.new(dummy_players(15), config, seed=1)
+    game_2 = Game.new(dummy_players(15), config.model_dump_json(), seed=1)
+
+    assert game_1.compiled is compile_config(config)
+    assert game_1.dump_state() == game_2.dump_state()
+
+
+def test_compiled_config_pickles():
+    logging.info("--- TEST: Compiled config pickles ---")
+    compiled = compile_config(dummy_config())
+
+    assert pickle.loads(pickle.dumps(compiled)) is compiled
+
+
+def test_compiled_key_is_canonical():
+    logging.info("--- TEST: Compiled key is canonical ---")
+    config = dummy_config(roles=["Citizen", "Mafioso"])
+    compiled = compile_config(config)
+
+    assert compile_config(json.dumps(config.model_dump(), indent=2)) is compiled
+    assert compile_config(config.model_dump_json()).key == compiled.key
@@ -0,0 +1,120 @@
+import logging
+
+import pytest
+from conftest import dummy_config, dummy_players
+
+import engine
+from engine.models.day import Day, Phase, Verdict
+
+ROLES = ["Citizen", "Doctor", "Bodyguard", "Mafioso", "Godfather"]
+
+
+def new_day(players: int = 7, **kwargs) -> Day:
+    game = engine.new_game(dummy_players(players), dummy_config(roles=ROLES), seed=1)
+    return Day(game, **kwargs)
+
+
+def test_majority_is_tracked_as_votes_arrive():
+    logging.info("--- TEST: Majority is tracked as votes arrive ---")
+    day = new_day(7)
+
+    assert day.threshold == 4
+    assert [day.vote(voter, 1) for voter in (2, 3, 4)] == [None, None, None]
+    assert day.vote(5, 1) == 1, "4 of 7 is a majority"
+
+    # Changing or withdrawing a vote can take the majority away again
+    assert day.vote(5, 2) is None
+    assert day.vote(6, 1) == 1
+    assert day.vote(6, None) is None
+    assert day.counts[1] == 3 and day.counts[2] == 1
+
+    with pytest.raises(ValueError):
+        day.vote(1, 1)
+    with pytest.raises(ValueError):
+        day.verdict(2, Verdict.GUILTY)
+
+
+def test_guilty_verdict_ends_in_a_lynch():
+    logging.info("--- TEST: Guilty verdict ends in a lynch ---")
+    day = new_day(5)
+    for voter in (2, 3, 4):
+        day.vote(voter, 1)
+
+    assert day.advance() == Phase.DEFENSE
+    assert day.accused == 1
+    assert day.advance() == Phase.TRIAL
+
+    with pytest.raises(ValueError):
+        day.verdict(1, "innocent")
+    assert day.verdict(2, "guilty")
+    assert not day.verdict(3, "innocent"), "Ties go to the accused"
+    assert day.verdict(4, "guilty")
+
+    assert day.advance() == Phase.LYNCH
+    assert day.advance() == Phase.OVER
+    assert not day.game.get_actor_by_number(1).alive
+    assert day.lynched.actors[1].alive is False
+
+
+def test_day_ends_after_max_polls():
+    logging.info("--- TEST: Day ends after max polls ---")
+    day = new_day(5, max_polls=2)
+
+    assert day.advance() == Phase.POLL
+    for voter in (2, 3, 4):
+        day.vote(voter, 1)
+    assert day.advance() == Phase.DEFENSE
+    day.advance()
+    day.verdict(2, Verdict.INNOCENT)
+
+    assert day.advance() == Phase.OVER, "Innocent on the last poll ends the day"
+    assert day.votes == {} and day.majority is None
+    assert all(actor.alive for actor in day.game.actors)
+    with pytest.raises(ValueError):
+        day.advance()
+
+
+def test_failed_poll_starts_the_next_from_scratch():
+    logging.info("--- TEST: Failed poll starts the next from scratch ---")
+    day = new_day(7)
+    for voter in (2, 3, 4):
+        day.vote(voter, 1)
+
+    assert day.advance() == Phase.POLL, "3 of 7 is no majority"
+    assert day.votes == {} and not day.counts
+
+    # The second poll's own votes decide it, not the first poll's
+    for voter in (1, 3, 4, 5):
+        day.vote(voter, 2)
+    assert day.counts[1] == 0
+    assert day.advance() == Phase.DEFENSE
+    assert day.accused == 2
+
+
+def test_day_dump_and_load():
+    logging.info("--- TEST: Day dump and load ---")
+    day = new_day(7)
+    for voter in (2, 3, 4, 5):
+        day.vote(voter, 1)
+    day.vote(6, 2)
+    day.advance()
+    day.advance()
+    day.verdict(2, "guilty")
+
+    loaded = Day.load(day.game, day.dump())
+
+    assert loaded.dump() == day.dump()
+    assert loaded.counts == day.counts
+    assert loaded.majority == 1
+    assert loaded.verdict_counts == day.verdict_counts
+
+
+def test_max_polls_setting():
+    config = dummy_config(roles=ROLES)
+    config.settings = {"maxPolls": 1}
+    game = engine.new_game(dummy_players(5), config, seed=1)
+
+    day = Day(game)
+
+    assert day.max_polls == 1
+    assert day.advance() == Phase.OVER
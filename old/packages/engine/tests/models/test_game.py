@@ -1,11 +1,15 @@
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import random
 from typing import List, Tuple
 
 import pytest
 from conftest import dummy_config, dummy_players
 from engine import Game, GameConfig, GameState, Player
+import engine
 from engine.roles.actor import Alignment
+from engine.utils.bitset import numbers_of
 
 
 @pytest.fixture
@@ -205,5 +209,407 @@ def test_game_resolve_town_win():
         assert winner.alignment is Alignment.TOWN
 
 
+def shootout_game() -> Game:
+    players = [
+        {
+            "id": "user-1",
+            "name": "UserName1",
+            "alias": "UserAlias1",
+            "role": "Bodyguard",
+            "number": 1,
+            "alive": True,
+            "targets": [3],
+        },
+        {
+            "id": "user-2",
+            "name": "UserName2",
+            "alias": "UserAlias2",
+            "role": "Mafioso",
+            "number": 2,
+            "alive": True,
+            "targets": [3],
+        },
+        {
+            "id": "user-3",
+            "name": "UserName3",
+            "alias": "UserAlias3",
+            "role": "Citizen",
+            "number": 3,
+            "alive": True,
+            "targets": [],
+        },
+    ]
+    state = {
+        "day": 1,
+        "players": [
+            {"number": p["number"], "alias": p["alias"], "alive": True} for p in players
+        ],
+        "graveyard": [],
+    }
+    config = {
+        "tags": ["town_government", "mafia_killing", "town_killing"],
+        "settings": {},
+        "roles": {
+            "Citizen": {"max": 0, "weight": 0.01, "settings": {"maxVests": 2}},
+            "Bodyguard": {"max": 1, "weight": 1},
+            "Mafioso": {"max": 2, "weight": 1},
+        },
+    }
+
+    return Game.load(
+        [Player(**player) for player in players],
+        GameConfig(**config),
+        GameState(**state),
+    )
+
+
+def test_dead_mafia_win_with_their_faction():
+    logging.info("--- TEST: Dead mafia win with their faction ---")
+    game = shootout_game()
+    # Swap the Bodyguard for a second Mafioso
+    players = game.dump_actors()
+    players[0]["role"] = "Mafioso"
+    game = Game.load(players, game.config, game.dump_state())
+
+    game.lynch(2)
+    game.lynch(3)
+
+    # Factions win as a whole, a member who died along the way still wins
+    winners = [actor.number for actor in game.check_for_win()]
+    assert winners == [1, 2]
+
+    loaded = Game.from_snapshot(game.snapshot(), game.config)
+    assert [actor.number for actor in loaded.check_for_win()] == winners
+
+
+def test_game_events_are_per_game():
+    logging.info("--- TEST: Game events are per game ---")
+    game_1 = shootout_game()
+    game_2 = shootout_game()
+
+    game_1.resolve()
+
+    assert game_1.events.get_by_id("mafioso_action") is not None
+    assert (
+        game_1.events.get_by_id("bodyguard_action") is None
+    ), "Actions without events should not be recorded"
+    assert len(game_2.events.events) == 0, "Events should not leak between games"
+
+    game_2.resolve()
+    assert game_2.events.dump() == game_1.events.dump()
+
+
+def test_game_resolve_concurrently():
+    logging.info("--- TEST: Game resolve concurrently ---")
+    expected = shootout_game()
+    expected.resolve()
+
+    def resolve(_):
+        game = shootout_game()
+        game.resolve()
+        return game.events.dump()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(resolve, range(32)))
+
+    for events in results:
+        assert events == expected.events.dump()
+
+
+def test_new_game_seeded():
+    logging.info("--- TEST: New game seeded ---")
+    config = dummy_config()
+
+    game_1 = Game.new(dummy_players(15), config, seed=1234)
+    game_2 = Game.new(dummy_players(15), config, seed=1234)
+
+    assert game_1.seed == game_2.seed == 1234
+    assert game_1.dump_actors() == game_2.dump_actors()
+    assert game_1.dump_state() == game_2.dump_state()
+
+
+def test_load_keeps_seed(test_new_game: Tuple[List[dict], dict, Game]):
+    logging.info("--- TEST: Load keeps seed ---")
+    players, config, game = test_new_game
+
+    assert game.state.seed == game.seed
+    loaded = Game.load(players, config, game.state)
+    assert loaded.seed == game.seed
+
+
+def godfather_game(seed: int) -> Game:
+    players = [
+        Player(id="user-1", name="N1", alias="A1", role="Godfather", number=1),
+        Player(id="user-2", name="N2", alias="A2", role="Mafioso", number=2),
+        Player(id="user-3", name="N3", alias="A3", role="Mafioso", number=3),
+        Player(id="user-4", name="N4", alias="A4", role="Mafioso", number=4),
+        Player(id="user-5", name="N5", alias="A5", role="Citizen", number=5),
+    ]
+    players[0].targets = [5]
+    config = GameConfig(
+        tags=[],
+        settings={},
+        roles={
+            "Citizen": {"max": 0, "weight": 0.01},
+            "Godfather": {"max": 1, "weight": 1},
+            "Mafioso": {"max": 3, "weight": 1},
+        },
+    )
+    state = GameState(
+        day=1,
+        seed=seed,
+        players=[
+            {"number": p.number, "alias": p.alias, "alive": True} for p in players
+        ],
+    )
+    return Game.load(players, config, state)
+
+
+def test_godfather_proxy_is_replayable():
+    logging.info("--- TEST: Godfather proxy is replayable ---")
+    proxies = set()
+    for seed in range(20):
+        game_1 = godfather_game(seed)
+        game_2 = godfather_game(seed)
+        game_1.resolve()
+        game_2.resolve()
+
+        assert game_1.events.dump() == game_2.events.dump()
+        assert game_1.dump_actors() == game_2.dump_actors()
+        proxy = game_1.events.get_by_id("godfather_action").get_by_id("godfather_proxy")
+        proxies.add(proxy.events[0].message)
+
+    assert len(proxies) > 1, "Different seeds should pick different proxies"
+
+
 def test_load_unbalanced():
     pass
+
+
+def test_load_trusted(test_new_game: Tuple[List[dict], dict, Game]):
+    logging.info("--- TEST: Load trusted ---")
+    _, config, game = test_new_game
+
+    actors = game.dump_actors()
+    state = game.dump_state()
+
+    validated = Game.load(actors, config, state)
+    trusted = Game.load(actors, config, state, trusted=True)
+
+    assert trusted.dump_actors() == validated.dump_actors()
+    assert trusted.dump_state() == validated.dump_state()
+
+    trusted.resolve()
+    validated.resolve()
+    assert trusted.dump_state() == validated.dump_state()
+
+
+def test_load_trusted_possible_targets():
+    logging.info("--- TEST: Load trusted possible targets ---")
+    data = {"id": "user-1", "name": "N1", "alias": "A1", "possibleTargets": [[2, 3]]}
+
+    assert Player.trusted(data).possible_targets == [0b1100]
+    assert Player.trusted(data) == Player(**data)
+
+
+def test_dump_possible_targets_as_numbers():
+    logging.info("--- TEST: Dump possible targets as numbers ---")
+    config = dummy_config(roles=["Citizen", "Doctor", "Mafioso"]).model_dump()
+    config["settings"] = {"maxPlayers": 100}
+    game = engine.new_game(dummy_players(100), config, seed=5)
+
+    dumps = game.dump_actors()
+    doctor = next(d for d in dumps if d["role"] == "Doctor")
+    # Numbers rather than masks, which JSON clients can't hold past 53 players
+    assert doctor["possibleTargets"] == [
+        [n for n in range(1, 101) if n != doctor["number"]]
+    ]
+
+    loaded = Game.load(json.loads(json.dumps(dumps)), config, game.dump_state())
+    assert [a.possible_targets for a in loaded.actors] == [
+        a.possible_targets for a in game.actors
+    ]
+
+
+def test_resolve_change_set():
+    logging.info("--- TEST: Resolve change set ---")
+    game = shootout_game()
+    # The Citizen hides in their vest as well
+    citizen = game.get_actor_by_number(3)
+    citizen.set_targets([citizen])
+
+    changes = game.resolve()
+
+    assert changes.day == 2
+    assert changes.numbers == [1, 2, 3]
+    assert changes.actors[1].alive is False
+    assert changes.actors[2].alive is False
+    assert changes.actors[3].alive is None
+    assert changes.actors[3].role_actions == {"remainingVests": 1}
+    assert sorted(record["number"] for record in changes.graveyard) == [1, 2]
+
+    dumped = changes.dump()
+    # Spent targets are cleared for the next night
+    assert dumped["actors"][2] == {
+        "number": 3,
+        "targets": [],
+        "roleActions": {"remainingVests": 1},
+    }
+
+    # Only the deaths are public, the Mafioso's allies go to the Mafioso alone
+    public = changes.dump_public()
+    assert public["actors"] == [
+        {"number": 1, "alive": False},
+        {"number": 2, "alive": False},
+    ]
+    assert public["graveyard"] == dumped["graveyard"]
+    private = changes.dump_private()
+    assert sorted(private) == [1, 2, 3]
+    assert private[1]["actors"][0] == {
+        "number": 1,
+        "targets": [],
+        "possibleTargets": [],
+    }
+    assert private[2]["actors"][0]["allies"][0]["role"] == "Mafioso"
+    assert private[3] == {
+        "day": 2,
+        "actors": [{"number": 3, "targets": [], "roleActions": {"remainingVests": 1}}],
+    }
+
+
+def test_lynch_change_set():
+    logging.info("--- TEST: Lynch change set ---")
+    game = shootout_game()
+
+    changes = game.lynch(2)
+
+    # The Bodyguard can no longer guard the Mafioso
+    assert changes.numbers == [1, 2]
+    assert changes.actors[1].possible_targets == [[3]]
+    assert changes.actors[2].alive is False
+    assert changes.graveyard[0]["cod"] == "They were lynched"
+
+    assert not game.lynch(2), "Lynching the dead again changes nothing"
+
+
+def test_change_set_keeps_stored_actors_fresh():
+    logging.info("--- TEST: Change set keeps stored actors fresh ---")
+    game = engine.new_game(dummy_players(7), dummy_config(), seed=2)
+    stored = {actor.number: actor.dump_state() for actor in game.actors}
+
+    mafioso = next(a for a in game.actors if a.role_name == "Mafioso")
+    victim = numbers_of(mafioso.possible_targets[0])[0]
+    mafioso.set_targets([game.get_actor_by_number(victim)])
+    changes = game.resolve()
+
+    # Rewrite only what changed, the way save_game_changes does
+    for number in changes.numbers:
+        stored[number] = game.get_actor_by_number(number).dump_state()
+
+    loaded = Game.from_snapshot(game.snapshot(), game.config)
+    assert [stored[a.number] for a in loaded.actors] == loaded.dump_actors()
+
+
+def test_graveyard_round_trip():
+    logging.info("--- TEST: Graveyard round trip ---")
+    game = shootout_game()
+    game.resolve()
+    game.resolve()
+
+    # Both died in the shootout on night 2, another night passing changes nothing
+    assert [(r["number"], r["dod"]) for r in game.graveyard] == [(1, 2), (2, 2)]
+
+    state = game.dump_state()
+    loaded = Game.load(game.dump_actors(), game.config, state)
+    assert loaded.dump_state()["graveyard"] == state["graveyard"]
+
+    loaded.resolve()
+    assert loaded.dump_state()["graveyard"] == state["graveyard"]
+
+
+def test_graveyard_drops_duplicates():
+    logging.info("--- TEST: Graveyard drops duplicates ---")
+    game = shootout_game()
+    game.lynch(3)
+    state = game.dump_state()
+    state["graveyard"] = state["graveyard"] * 2
+
+    loaded = Game.load(game.dump_actors(), game.config, state)
+    assert len(loaded.graveyard) == 1
+    assert loaded.get_actor_by_number(3).cod == "They were lynched"
+
+
+def large_config(players: int) -> dict:
+    config = dummy_config(roles=["Citizen", "Doctor", "Bodyguard", "Mafioso"])
+    config = config.model_dump(by_alias=True)
+    config["settings"] = {"maxPlayers": players}
+    return config
+
+
+def test_player_limit_is_configurable():
+    logging.info("--- TEST: Player limit is configurable ---")
+    with pytest.raises(ValueError):
+        engine.new_game(dummy_players(16), dummy_config())
+
+    game = engine.new_game(dummy_players(200), large_config(200), seed=1)
+    loaded = Game.load(game.dump_actors(), game.config, game.dump_state())
+    assert loaded.dump_actors() == game.dump_actors()
+
+    mafioso = next(a for a in loaded.actors if a.role_name == "Mafioso")
+    victim = numbers_of(mafioso.possible_targets[0])[-1]
+    assert victim > 15
+    mafioso.set_targets([loaded.get_actor_by_number(victim)])
+
+    loaded.resolve()
+    assert loaded.get_actor_by_number(victim).alive is False
+
+
+def test_default_limit_rejects_large_numbers():
+    logging.info("--- TEST: Default limit rejects large numbers ---")
+    data = {"id": "user-16", "name": "N16", "alias": "A16", "number": 16}
+
+    with pytest.raises(ValueError):
+        Player.model_validate(data)
+    assert Player.model_validate(data, context={"max_players": 16}).number == 16
+
+
+def test_fork_leaves_parent_untouched():
+    logging.info("--- TEST: Fork leaves parent untouched ---")
+    game = shootout_game()
+    actors, state = game.dump_actors(), game.dump_state()
+
+    branch = game.fork()
+    changes = branch.resolve()
+
+    assert changes.numbers == [1, 2]
+    assert branch.dump_state()["graveyard"] != state["graveyard"]
+    assert game.dump_actors() == actors
+    assert game.dump_state() == state
+    assert [t.number for t in game.get_actor_by_number(2).targets] == [3]
+    assert all(a.index is game.index for a in game.actors)
+    assert len(game.events.events) == 0
+
+    # Branches roll the same dice, so the parent plays out the same night
+    game.resolve()
+    assert game.dump_state() == branch.dump_state()
+    assert game.events.dump() == branch.events.dump()
+
+
+def test_fork_what_ifs():
+    logging.info("--- TEST: Fork what ifs ---")
+    game = shootout_game()
+    mafioso = game.get_actor_by_number(2)
+
+    outcomes = {}
+    for target in [1, 3]:
+        branch = game.fork(recording=False)
+        branch_mafioso = branch.get_actor_by_number(2)
+        assert branch_mafioso is not mafioso
+        branch_mafioso.set_targets([branch.get_actor_by_number(target)])
+        branch.resolve()
+        outcomes[target] = sorted(a.number for a in branch.dead_actors)
+        assert len(branch.events.events) == 0
+
+    # Shooting the Bodyguard goes through, their target starts a shootout
+    assert outcomes == {1: [1], 3: [1, 2]}
+    assert game.dead_actors == ()
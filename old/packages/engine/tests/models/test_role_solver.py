@@ -0,0 +1,61 @@
+import logging
+import random
+
+from conftest import dummy_config
+from engine.models import GameConfig
+from engine.models.role_solver import RoleSolver
+
+
+def test_solver_respects_max():
+    logging.info("--- TEST: Role solver respects max ---")
+    config = dummy_config()
+    solver = config.role_solver()
+
+    for seed in range(50):
+        roles, failed = solver.solve(random.Random(seed))
+        assert len(roles) == len(config.tags)
+        assert len(failed) == len(solver.unfillable)
+        for role, settings in config.roles.items():
+            if role != "Citizen":
+                assert roles.count(role) <= settings.max
+
+
+def test_solver_avoids_dead_ends():
+    logging.info("--- TEST: Role solver avoids dead ends ---")
+    # Picking Doctor for the first tag would leave the second unfillable
+    config = GameConfig(
+        tags=["town_protective", "Doctor"],
+        settings={},
+        roles={
+            "Citizen": {"max": 0, "weight": 1},
+            "Doctor": {"max": 1, "weight": 100},
+            "Bodyguard": {"max": 1, "weight": 1},
+        },
+    )
+    solver = RoleSolver(config.tags, config.roles)
+    assert solver.feasible
+
+    for seed in range(20):
+        roles, failed = solver.solve(random.Random(seed))
+        assert failed == []
+        assert roles == ["Bodyguard", "Doctor"]
+
+
+def test_solver_reports_unfillable():
+    logging.info("--- TEST: Role solver reports unfillable tags ---")
+    config = GameConfig(
+        tags=["mafia_killing", "mafia_killing", "town_government"],
+        settings={},
+        roles={
+            "Citizen": {"max": 0, "weight": 1},
+            "Mafioso": {"max": 1, "weight": 1},
+        },
+    )
+    solver = config.role_solver()
+
+    assert not solver.feasible
+    assert sorted(solver.unfillable) == ["mafia_killing", "town_government"]
+
+    roles, failed = solver.solve(random.Random(0))
+    assert sorted(roles) == ["Citizen", "Citizen", "Mafioso"]
+    assert len(failed) == 2
@@ -3,7 +3,7 @@ from typing import Tuple
 
 import pytest
 
-from engine import models, roles
+from engine import events, models, roles
 
 
 @pytest.fixture
@@ -65,3 +65,33 @@ def test_actor_die(
 
     assert citizen_1.alive == False
     assert citizen_1.cod == "Killed by God"
+
+
+def test_actors_and_events_have_no_dict():
+    logging.info("--- TEST: Actors and events have no dict ---")
+    player = models.Player(name="A", alias="a", number=1, id="1")
+    for role in ["Citizen", "Doctor", "Bodyguard", "Godfather", "Mafioso"]:
+        actor = getattr(roles, role)(player)
+        assert not hasattr(actor, "__dict__"), f"{role} should only use slots"
+
+    group = events.GameEventGroup(group_id="root")
+    group.new_event(events.GameEvent(event_id="x", targets=["*"]))
+    for value in [group, group.events[0], events.EventCollector()]:
+        assert not hasattr(value, "__dict__")
+
+
+def test_new_night_resets_in_place(
+    test_actor_boostrap: Tuple[roles.Citizen, roles.Citizen, roles.Mafioso],
+):
+    logging.info("--- TEST: New night resets in place ---")
+    citizen_1, citizen_2, mafioso_1 = test_actor_boostrap
+
+    assert citizen_1.visitors == () and citizen_2.visitors is citizen_1.visitors
+    mafioso_1.visit(citizen_1)
+    visitors = citizen_1.visitors
+
+    citizen_1.new_night()
+
+    assert citizen_1.visitors is visitors and visitors == []
+    mafioso_1.visit(citizen_1)
+    assert citizen_1.visitors is visitors
@@ -34,8 +34,8 @@ def test_bodyguard_find_targets(
     bodyguard.find_possible_targets([citizen, bodyguard, mafioso])
 
     assert len(bodyguard.possible_targets) == 1
-    assert len(bodyguard.possible_targets[0]) == 2
-    assert bodyguard not in bodyguard.possible_targets[0]
+    assert bodyguard.possible_targets[0].bit_count() == 2
+    assert not bodyguard.can_target(0, bodyguard)
 
 
 def test_bodyguard_action(
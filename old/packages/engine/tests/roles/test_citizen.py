@@ -38,8 +38,7 @@ def test_citizen_find_targets(
     citizen_1.find_possible_targets([citizen_2, mafioso_1])
 
     assert len(citizen_1.possible_targets) == 1
-    assert len(citizen_1.possible_targets[0]) == 1
-    assert citizen_1.possible_targets[0][0] == citizen_1
+    assert citizen_1.possible_targets[0] == citizen_1.bit
 
 
 def test_citizen_find_allies(
@@ -45,8 +45,8 @@ def test_doctor_find_targets(
 
     print(doctor.possible_targets)
     assert len(doctor.possible_targets) == 1
-    assert len(doctor.possible_targets[0]) == 3
-    assert doctor not in doctor.possible_targets[0]
+    assert doctor.possible_targets[0].bit_count() == 3
+    assert not doctor.can_target(0, doctor)
 
 
 def test_doctor_action_simple(
@@ -0,0 +1,45 @@
+import logging
+import subprocess
+import sys
+
+import pytest
+import engine.roles as roles
+from engine.roles import ROLE_SPECS, ROLE_TAGS_MAP, get_role, import_role
+
+
+def test_registry_matches_role_classes():
+    logging.info("--- TEST: Registry matches role classes ---")
+    for spec in ROLE_SPECS:
+        Role = spec.role_class
+        assert Role.__name__ == spec.name
+        assert list(Role.tags) == list(spec.tags)
+        assert ROLE_TAGS_MAP[spec.name] == list(spec.tags)
+        assert import_role(spec.name) is Role
+        assert getattr(roles, spec.name) is Role
+
+
+def test_role_list_in_turn_order():
+    logging.info("--- TEST: Role list is in turn order ---")
+    priorities = [get_role(Role.__name__).priority for Role in roles.ROLE_LIST]
+
+    assert priorities == sorted(priorities)
+    assert len(set(priorities)) == len(priorities)
+
+
+def test_unknown_role():
+    logging.info("--- TEST: Unknown role ---")
+    with pytest.raises(ValueError):
+        import_role("Mayor")
+
+
+def test_roles_load_lazily():
+    logging.info("--- TEST: Roles load lazily ---")
+    script = (
+        "import sys, engine;"
+        "print(sorted(m for m in sys.modules if m.startswith('engine.roles.')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "['engine.roles.actor', 'engine.roles.registry']"
@@ -0,0 +1,103 @@
+import logging
+from dataclasses import asdict
+
+from conftest import dummy_config
+
+from engine.events import BROADCAST, GameEvent, GameEventGroup
+from engine.simulation import play_game
+from engine.templates import TEMPLATES, VERSION, catalogue, render
+
+
+def event_tree() -> GameEventGroup:
+    root = GameEventGroup(group_id="root")
+    action = GameEventGroup(group_id="mafioso_action", duration=3)
+    action.new_event(GameEvent(event_id="mafia_kill", targets=["*"]))
+    action.new_event(
+        GameEvent(event_id="killed", targets=["user-1"], template="killed_by_mafia")
+    )
+    root.new_event_group(action)
+
+    revive = GameEventGroup(group_id="doctor_revive")
+    revive.new_event(GameEvent(event_id="revived", targets=["user-1"]))
+    revive.new_event(GameEvent(event_id="revive_success", targets=["user-2"]))
+    root.new_event_group(revive)
+    return root
+
+
+def test_dump_matches_asdict():
+    logging.info("--- TEST: Event dump matches asdict ---")
+    root = event_tree()
+
+    def without_empty_params(value):
+        # Events leave out their params when they have none
+        if isinstance(value, list):
+            return [without_empty_params(item) for item in value]
+        if isinstance(value, dict):
+            return {
+                key: without_empty_params(item)
+                for key, item in value.items()
+                if not (key == "params" and item is None)
+            }
+        return value
+
+    assert root.dump() == without_empty_params(asdict(root)["events"])
+
+
+def test_dump_indexed():
+    logging.info("--- TEST: Event dump indexed by recipient ---")
+    tree, index = event_tree().dump_indexed()
+
+    assert list(index) == [BROADCAST, "user-1", "user-2"]
+    assert [e["event_id"] for e in index[BROADCAST]] == ["mafia_kill"]
+    assert [e["event_id"] for e in index["user-1"]] == ["killed", "revived"]
+    assert [e["event_id"] for e in index["user-2"]] == ["revive_success"]
+
+    # Index entries are the tree's events along with their offsets
+    assert index["user-1"][0] == {
+        "offset": 0,
+        "group_id": "mafioso_action",
+        **tree[0]["events"][1],
+    }
+    assert index["user-1"][1]["offset"] == 3
+
+
+def test_timeline_offsets():
+    logging.info("--- TEST: Event timeline offsets ---")
+    root = GameEventGroup(group_id="root")
+    for action in ["mafioso_action", "bodyguard_action"]:
+        group = GameEventGroup(group_id=action)
+        kill = GameEventGroup(group_id=f"{action}_kill", duration=3)
+        kill.new_event(GameEvent(event_id="kill", targets=["*"]))
+        group.new_event_group(kill)
+        group.new_event(GameEvent(event_id="after", targets=["*"]))
+        root.new_event_group(group)
+
+    timeline = root.timeline()
+
+    assert [(e["event_id"], e["offset"]) for e in timeline] == [
+        ("kill", 0),
+        ("after", 3),
+        ("kill", 3),
+        ("after", 6),
+    ]
+    assert root.duration == 6
+
+
+def test_events_use_catalogue_templates():
+    logging.info("--- TEST: Events use catalogue templates ---")
+    config = dummy_config(
+        roles=["Citizen", "Doctor", "Bodyguard", "Mafioso", "Godfather"]
+    )
+
+    used = set()
+    for seed in range(30):
+        game, _ = play_game(config, 15, seed=seed, record_events=True)
+        for entry in game.events.timeline():
+            if entry["template"] is None:
+                continue
+            used.add(entry["template"])
+            assert render(entry["template"], entry.get("params"))
+
+    assert used <= set(TEMPLATES)
+    assert "{" not in render("godfather_proxy", {"alias": "Alias1"})
+    assert catalogue() == {"version": VERSION, "templates": dict(TEMPLATES)}
@@ -1,11 +1,16 @@
+import json
 import logging
 import random
+import threading
 from typing import List, Tuple
 
 from conftest import dummy_config, dummy_players
 
 import pytest
 import engine
+from engine.events import index_by_recipient
+from engine.models import GameConfig, GameState, Player
+from engine.utils.logging import collect_logs, logger
 
 
 def test_new_game():
@@ -27,3 +32,166 @@ def test_load_and_lynch():
 
 def test_load_unbalanced():
     pass
+
+
+def resolve_input(mafioso_target: int, bodyguard_target: int):
+    players = [
+        {
+            "id": "user-1",
+            "name": "User1",
+            "alias": "Alias1",
+            "role": "Bodyguard",
+            "number": 1,
+            "targets": [bodyguard_target],
+        },
+        {
+            "id": "user-2",
+            "name": "User2",
+            "alias": "Alias2",
+            "role": "Mafioso",
+            "number": 2,
+            "targets": [mafioso_target],
+        },
+        {
+            "id": "user-3",
+            "name": "User3",
+            "alias": "Alias3",
+            "role": "Citizen",
+            "number": 3,
+            "targets": [],
+            "roleActions": {"remainingVests": 2},
+        },
+        {
+            "id": "user-4",
+            "name": "User4",
+            "alias": "Alias4",
+            "role": "Citizen",
+            "number": 4,
+            "targets": [],
+            "roleActions": {"remainingVests": 2},
+        },
+    ]
+    state = {
+        "day": 1,
+        "seed": 1,
+        "players": [
+            {"number": p["number"], "alias": p["alias"], "alive": True} for p in players
+        ],
+        "graveyard": [],
+    }
+    config = dummy_config(roles=["Citizen", "Bodyguard", "Mafioso"])
+
+    return [Player(**p) for p in players], config, GameState(**state)
+
+
+def test_resolve_many():
+    targets = [(3, 3), (3, 4), (4, 4), (1, 3), (4, 3)]
+
+    expected = [engine.resolve_game(*resolve_input(*t)) for t in targets]
+    results = engine.resolve_many([resolve_input(*t) for t in targets], max_workers=2)
+
+    assert results == expected, "Batch results should match resolving one at a time"
+
+    # Bodyguard protecting the Mafioso's target ends in a shootout, Town wins
+    assert sorted(results[0]["winners"]) == [1, 3, 4]
+    dead = [p["number"] for p in results[0]["state"]["players"] if not p["alive"]]
+    assert sorted(dead) == [1, 2]
+
+
+def test_resolve_many_serial():
+    results = engine.resolve_many([resolve_input(3, 4)], max_workers=1)
+
+    assert len(results) == 1
+    dead = [p["number"] for p in results[0]["state"]["players"] if not p["alive"]]
+    assert dead == [3]
+
+
+def test_new_game_strict():
+    config = dummy_config(roles=["Citizen", "Bodyguard", "Mafioso"])
+
+    with pytest.raises(ValueError):
+        engine.new_game(dummy_players(15), config, strict=True)
+
+
+def test_resolve_game_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = engine.resolve_game(*resolve_input(3, 4))
+
+    messages = [entry["message"] for entry in result["log"]]
+    assert any("died" in message for message in messages)
+    assert all(entry["level"] != "DEBUG" for entry in result["log"])
+    assert list(tmp_path.iterdir()) == [], "The engine should not write any files"
+
+    quiet = engine.resolve_game(*resolve_input(3, 4), log_level=logging.CRITICAL)
+    assert quiet["log"] == []
+    assert quiet["state"] == result["state"]
+
+
+def test_log_collector_is_bounded():
+    with collect_logs(capacity=3) as log:
+        for i in range(5):
+            logger.info("line %s", i)
+
+    assert [entry["message"] for entry in log.dump()] == ["line 2", "line 3", "line 4"]
+    assert log.dropped == 2
+
+
+def test_collect_logs_is_per_thread():
+    before = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        others = []
+        with collect_logs(logging.DEBUG) as log:
+            level = logger.level
+            other = threading.Thread(
+                target=lambda: others.append(logger.isEnabledFor(logging.DEBUG))
+            )
+            other.start()
+            other.join()
+            logger.debug("mine")
+    finally:
+        logger.setLevel(before)
+
+    assert level == logging.WARNING, "The logger's level is left alone"
+    assert others == [False], "Other threads don't log at the collected level"
+    assert [entry["message"] for entry in log.dump()] == ["mine"]
+
+
+def test_resolve_game_timeline():
+    result = engine.resolve_game(*resolve_input(3, 3))
+
+    offsets = [entry["offset"] for entry in result["timeline"]]
+    assert offsets == sorted(offsets)
+    assert result["duration"] > 0
+    assert all(offset < result["duration"] for offset in offsets)
+    assert {e["event_id"] for e in result["timeline"]} >= {"bodyguard_shootout"}
+    assert index_by_recipient(result["timeline"])["*"][0]["offset"] == 0
+    # The timeline is the only copy of the events
+    assert "events" not in result and "eventsByRecipient" not in result
+
+
+def test_resolve_result():
+    result = engine.resolve(*resolve_input(3, 3))
+    dump = result.dump()
+
+    assert {key: value for key, value in dump.items() if key != "metrics"} == (
+        engine.resolve_game(*resolve_input(3, 3))
+    )
+    assert json.loads(json.dumps(dump))["winners"] == result.winners
+    assert set(result.metrics) >= {"load", "resolve", "checkForWin", "dump", "total"}
+    assert result.metrics["actors"] == 4
+    assert result.metrics["events"] == len(result.timeline)
+    assert result.metrics["total"] >= result.metrics["resolve"] > 0
+
+
+def test_single_pass_dump_matches():
+    game = engine.load_game(*resolve_input(3, 4))
+    game.resolve()
+
+    state, actors = game.dump()
+    assert state == game.state.model_dump()
+    assert state == game.dump_state()
+    assert actors == game.dump_actors()
+    for actor, dump in zip(game.actors, actors):
+        expected = {**actor.player.model_dump(by_alias=True), **dump}
+        assert list(dump) == list(expected), "Same fields in the same order"
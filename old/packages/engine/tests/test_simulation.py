@@ -0,0 +1,207 @@
+import logging
+import random
+
+import pytest
+from conftest import dummy_config, dummy_players
+
+import engine
+from engine.simulation import (
+    Bot,
+    WinRate,
+    bot_lynch,
+    bot_targets,
+    headless,
+    no_lynch,
+    no_targets,
+    play_game,
+    simulate,
+    tally,
+)
+
+ROLES = ["Citizen", "Doctor", "Bodyguard", "Mafioso", "Godfather"]
+
+
+def test_simulate():
+    logging.info("--- TEST: Simulate ---")
+    config = dummy_config(roles=ROLES)
+
+    report = simulate(config, games=40, seed=7, workers=1)
+
+    assert report.games == 40
+    assert report.alignments["Town"].total == 40
+    assert report.alignments["Mafia"].total == 40
+    for rate in [*report.roles.values(), *report.alignments.values()]:
+        low, high = rate.interval()
+        assert 0 <= low <= rate.rate <= high <= 1
+
+
+def test_simulate_is_seeded():
+    logging.info("--- TEST: Simulate is seeded ---")
+    config = dummy_config(roles=ROLES)
+
+    serial = simulate(config, games=30, seed=3, workers=1)
+    parallel = simulate(config, games=30, seed=3, workers=2, chunk_size=7)
+
+    assert serial.dump() == parallel.dump(), "Workers should not change the results"
+
+
+def test_play_game_draw():
+    logging.info("--- TEST: Play game draw ---")
+    config = dummy_config(roles=ROLES)
+
+    game, winners = play_game(
+        config,
+        15,
+        seed=1,
+        target_policy=no_targets,
+        lynch_policy=no_lynch,
+        max_days=3,
+    )
+
+    assert winners is None, "Nobody can die so nobody can win"
+    assert len(game.dead_actors) == 0
+    assert len(game.events.events) == 0
+
+
+def test_headless_only_silences_the_engine(caplog):
+    logging.info("--- TEST: Headless only silences the engine ---")
+    engine_logger = logging.getLogger("engine")
+    host_logger = logging.getLogger("host")
+
+    with caplog.at_level(logging.INFO):
+        with headless(), headless():
+            engine_logger.info("engine line")
+            host_logger.info("host line")
+        engine_logger.info("engine again")
+
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.name in ("engine", "host")
+    ]
+    assert messages == ["host line", "engine again"]
+
+
+def test_win_rate_interval():
+    rate = WinRate(wins=50, total=100)
+
+    low, high = rate.interval()
+    assert rate.rate == 0.5
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+    assert WinRate().interval() == (0.0, 0.0)
+
+
+def test_bots_choose_legal_actions():
+    logging.info("--- TEST: Bots choose legal actions ---")
+    game = engine.new_game(dummy_players(15), dummy_config(roles=ROLES), seed=5)
+    bot = Bot(random.Random(1), activity=1)
+    state = game.dump_state()
+
+    for actor, dump in zip(game.actors, game.dump_actors()):
+        allies = {ally["number"] for ally in dump["allies"]}
+        targets = bot.choose_targets(dump)
+        assert len(targets) == len(actor.possible_targets)
+        for slot, number in enumerate(targets):
+            assert actor.can_target(slot, game.get_actor_by_number(number))
+            assert actor.role_name == "Citizen" or number not in allies
+
+        vote = bot.choose_vote(dump, state)
+        assert vote not in allies | {actor.number}
+
+
+def test_tally_needs_a_majority():
+    assert tally({1: 3, 2: 3, 3: None, 4: 1}, voters=4) is None
+    assert tally({1: 3, 2: 3, 3: 3, 4: 1}, voters=4) == 3
+    assert tally({1: None}, voters=1) is None
+
+
+def test_simulate_with_bots():
+    logging.info("--- TEST: Simulate with bots ---")
+    config = dummy_config(roles=ROLES)
+
+    report = simulate(
+        config,
+        games=10,
+        seed=2,
+        workers=1,
+        target_policy=bot_targets,
+        lynch_policy=bot_lynch,
+    )
+
+    assert report.games == 10
+
+
+def reference_winners(game) -> list:
+    # Win conditions worked out by scanning the living rather than asking the
+    # index. Factions win as a whole, so their dead members win too
+    alive = game.alive_actors
+    mafia = [a for a in alive if a.alignment.value == "Mafia"]
+    winners = []
+    for actor in game.actors:
+        if actor.alignment.value == "Town":
+            won = not mafia or (
+                actor.role_name == "Citizen"
+                and len(alive) == 2
+                and any(a.role_name == "Citizen" for a in alive)
+            )
+        else:
+            won = len(mafia) == len(alive)
+        if won:
+            winners.append(actor)
+    return winners or None
+
+
+def test_win_counters_match_scanning():
+    logging.info("--- TEST: Win counters match scanning ---")
+    config = dummy_config(roles=ROLES)
+
+    for seed in range(30):
+        game, winners = play_game(config, 15, seed=seed, max_days=5)
+        assert winners == reference_winners(game)
+        assert game.index.alive_count() == len(game.alive_actors)
+
+
+def test_kernel_shootout():
+    logging.info("--- TEST: Kernel shootout ---")
+    np = pytest.importorskip("numpy")
+    from engine.simulation.kernel import (
+        BODYGUARD,
+        CITIZEN,
+        DOCTOR,
+        MAFIOSO,
+        NO_TARGET,
+        NightBatch,
+    )
+
+    # The Bodyguard and the Mafioso both go for the Citizen, in the first game
+    # the Doctor saves the Bodyguard
+    seats = [BODYGUARD, MAFIOSO, CITIZEN, DOCTOR]
+    batch = NightBatch(
+        role=np.array([seats, seats], np.int8),
+        alive=np.ones((2, 4), bool),
+        vests=np.array([[0, 0, 2, 0], [0, 0, 2, 0]], np.int16),
+        day=np.ones(2, np.int32),
+    )
+    targets = np.array([[2, 2, NO_TARGET, 0], [2, 2, 2, 1]], np.int16)
+
+    died = batch.resolve(targets, np.random.default_rng(0))
+
+    assert died.tolist() == [
+        [False, True, False, False],
+        [True, False, False, False],
+    ], "The Doctor on the Mafioso saves him in the second game"
+    assert batch.vests[:, 2].tolist() == [2, 1]
+    assert batch.day.tolist() == [2, 2]
+
+
+def test_kernel_matches_engine():
+    logging.info("--- TEST: Kernel matches engine ---")
+    pytest.importorskip("numpy")
+    from engine.simulation.cross_check import cross_check
+
+    report = cross_check(dummy_config(roles=ROLES), games=300, nights=3, seed=1)
+
+    assert report.replayed > 0
+    assert report.mismatched == []
+    assert report.consistent(), report.dump()
@@ -0,0 +1,105 @@
+import json
+import logging
+
+import pytest
+from conftest import dummy_config, dummy_players
+
+import engine
+from engine.models import Game
+from engine.snapshot import read_snapshot
+from engine.utils.bitset import numbers_of
+
+
+def snapshot_game() -> Game:
+    game = engine.new_game(dummy_players(15), dummy_config(), seed=7)
+    # Everyone with a target picks their first option
+    for actor in game.actors:
+        if actor.possible_targets and actor.possible_targets[0]:
+            number = numbers_of(actor.possible_targets[0])[0]
+            actor.set_targets([game.get_actor_by_number(number)])
+    return game
+
+
+def test_snapshot_round_trip():
+    logging.info("--- TEST: Snapshot round trip ---")
+    game = snapshot_game()
+    data = game.snapshot()
+
+    loaded = Game.from_snapshot(data, dummy_config())
+
+    assert loaded.dump_actors() == game.dump_actors()
+    assert loaded.dump_state() == game.dump_state()
+    # Targets chosen before the night is resolved survive the round trip
+    assert [a.targets for a in loaded.actors] == [
+        [loaded.get_actor_by_number(t.number) for t in a.targets] for a in game.actors
+    ]
+    assert loaded.snapshot() == data
+
+
+def test_snapshot_after_resolve_does_not_replay():
+    logging.info("--- TEST: Snapshot after resolve does not replay ---")
+    game = snapshot_game()
+    game.resolve()
+    vests = {a.number: a.dump_role_actions() for a in game.actors}
+
+    loaded = Game.from_snapshot(game.snapshot(), dummy_config())
+    assert all(not a.targets for a in loaded.actors)
+
+    # Nobody chose new targets, so the second night changes no one
+    loaded.resolve()
+    assert {a.number: a.dump_role_actions() for a in loaded.actors} == vests
+    assert loaded.dump_state()["graveyard"] == game.dump_state()["graveyard"]
+
+
+def test_snapshot_is_compact():
+    logging.info("--- TEST: Snapshot is compact ---")
+    game = snapshot_game()
+    as_json = json.dumps(game.dump_actors()) + json.dumps(game.dump_state())
+
+    assert len(game.snapshot()) * 4 < len(as_json)
+
+
+def test_snapshot_keeps_graveyard():
+    logging.info("--- TEST: Snapshot keeps graveyard ---")
+    game = snapshot_game()
+    game.lynch(3)
+
+    _, players, state = read_snapshot(game.snapshot())
+
+    assert state["graveyard"] == game.dump_state()["graveyard"]
+    assert [p["alive"] for p in players] == [a.alive for a in game.actors]
+
+
+def test_snapshot_needs_its_config():
+    logging.info("--- TEST: Snapshot needs its config ---")
+    data = snapshot_game().snapshot()
+
+    with pytest.raises(ValueError):
+        engine.load_snapshot(data, dummy_config(roles=["Citizen", "Mafioso"]))
+
+    with pytest.raises(ValueError):
+        engine.load_snapshot(b"JSON" + data[4:], dummy_config())
+
+
+def test_snapshot_corrupt():
+    logging.info("--- TEST: Snapshot corrupt ---")
+    data = snapshot_game().snapshot()
+
+    for cut in (0, 3, 5, 40, len(data) // 2, len(data) - 1):
+        with pytest.raises(ValueError, match="Corrupt snapshot"):
+            engine.load_snapshot(data[:cut], dummy_config())
+
+
+def test_snapshot_large_game():
+    logging.info("--- TEST: Snapshot large game ---")
+    config = dummy_config(roles=["Citizen", "Doctor", "Mafioso"]).model_dump()
+    config["settings"] = {"maxPlayers": 300}
+    game = engine.new_game(dummy_players(300), config, seed=3)
+
+    loaded = Game.from_snapshot(game.snapshot(), config)
+    assert loaded.dump_actors() == game.dump_actors()
+
+    game.lynch(299)
+    loaded = Game.from_snapshot(game.snapshot(), config)
+    assert loaded.dump_state() == game.dump_state()
+    assert loaded.get_actor_by_number(299).alive is False
@@ -0,0 +1,4 @@
+"""
+Load generation: bot users driving the REST routers against local stand-ins
+for DynamoDB, EventBridge, IoT and the auth tokens. See driver.py
+"""
@@ -0,0 +1,358 @@
+"""
+Drives bot users through lobbies and games and reports latency per route.
+
+Every lobby is played by its own thread: the host creates it, the rest browse
+and join, the host starts it and the game is played out night by night with
+Bots choosing from the same actor dumps a client gets. Finally everyone
+leaves. The REST routers in functions.rest.main are called with API Gateway
+events against the stand-ins in storage.py. There are no game routes yet,
+so nights and lynches go straight through the GameController the way a game
+Lambda would, and are reported as "game ..." stages.
+
+A resolver handles one request at a time, like a Lambda container. Lobbies
+are spread over --containers processes, each with its own stand-ins, and
+the lobbies in a container take turns at its resolver.
+
+    python -m functions.loadgen.driver --users 1000 --lobby-size 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from functions.loadgen.storage import LocalStack, install
+
+
+class RouteError(Exception):
+    pass
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest rank percentile of sorted :samples"""
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1, round(q / 100 * len(samples)) - 1))
+    return samples[rank]
+
+
+@dataclass
+class LatencyReport:
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, route: str, seconds: float, ok: bool = True) -> None:
+        with self.lock:
+            self.samples.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    @contextmanager
+    def time(self, route: str) -> Iterator[None]:
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(route, time.perf_counter() - start, ok)
+
+    def merge(self, samples: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+        with self.lock:
+            for route, seconds in samples.items():
+                self.samples.setdefault(route, []).extend(seconds)
+            for route, count in errors.items():
+                self.errors[route] = self.errors.get(route, 0) + count
+
+    def dump(self, elapsed: float) -> dict:
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+            routes[route] = {
+                "count": len(samples),
+                "errors": self.errors.get(route, 0),
+                "throughput": len(samples) / elapsed if elapsed else 0.0,
+                # Milliseconds
+                **{f"p{q}": percentile(samples, q) * 1000 for q in (50, 90, 99)},
+                "max": samples[-1] * 1000,
+            }
+        return {
+            "elapsed": elapsed,
+            "requests": sum(route["count"] for route in routes.values()),
+            "routes": routes,
+        }
+
+
+@dataclass
+class BotUser:
+    id: str
+    username: str
+    token: str
+    bot: Any  # engine.simulation.Bot
+
+
+class Driver:
+    """One container's worth of lobbies, played against its own stand-ins"""
+
+    def __init__(self, stack: LocalStack, seed: int = 0, max_days: int = 10) -> None:
+        import functions.rest.main as main
+
+        self.stack = stack
+        self.app = main.app
+        self.seed = seed
+        self.max_days = max_days
+        self.report = LatencyReport()
+        self.resolver = threading.Lock()
+        self.lobbies = 0
+        self.games = 0
+        self.failures: List[str] = []
+
+    def create_users(self, first: int, count: int) -> List[BotUser]:
+        from core.tables import UserTable
+        from core.utils import timestamp
+        from engine.simulation import Bot
+
+        users = []
+        for i in range(first, first + count):
+            user = UserTable.Entities.User(
+                id=f"bot-{i}",
+                createdAt=timestamp(),
+                username=f"Bot{i}",
+                provider="loadgen",
+                lastLogin=timestamp(),
+            )
+            UserTable.table.put_item(Item=user.serialize())
+            users.append(
+                BotUser(
+                    id=user.id,
+                    username=user.username,
+                    token=self.stack.auth.issue(user.id),
+                    bot=Bot(random.Random(f"{self.seed}:{user.id}")),
+                )
+            )
+        return users
+
+    def call(
+        self,
+        user: BotUser,
+        method: str,
+        path: str,
+        route: str = None,
+        body: dict = None,
+        query: Dict[str, str] = None,
+    ):
+        """Call the REST app as :user, timed under :route (defaults to :path)"""
+        event = {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": path,
+            "rawQueryString": "&".join(f"{k}={v}" for k, v in (query or {}).items()),
+            "queryStringParameters": query,
+            "headers": {
+                "Authorization": f"Bearer {user.token}",
+                "content-type": "application/json",
+            },
+            "requestContext": {
+                "http": {
+                    "method": method,
+                    "path": path,
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "127.0.0.1",
+                    "userAgent": "loadgen",
+                },
+                "requestId": f"loadgen-{user.id}",
+                "routeKey": "$default",
+                "stage": "$default",
+            },
+            "body": json.dumps(body) if body is not None else None,
+            "isBase64Encoded": False,
+        }
+
+        route = f"{method} {route or path}"
+        with self.resolver:
+            start = time.perf_counter()
+            response = self.app.resolve(event, None)
+            seconds = time.perf_counter() - start
+        ok = response["statusCode"] < 400
+        self.report.record(route, seconds, ok)
+
+        # Lambdas subscribed to whatever the request published run after it
+        for detail_type, seconds, error in self.stack.bus.drain():
+            self.report.record(f"event {detail_type}", seconds, error is None)
+            if error is not None:
+                self.failures.append(f"event {detail_type}: {error!r}")
+
+        if not ok:
+            raise RouteError(f"{route}: {response['statusCode']} {response['body']}")
+        return json.loads(response["body"]) if response.get("body") else None
+
+    def play_lobby(self, users: List[BotUser]) -> None:
+        host, *guests = users
+        lobby = self.call(host, "POST", "/lobbies", body={"name": host.username})
+        lobby_id = lobby["id"]
+
+        for guest in guests:
+            self.call(guest, "GET", "/lobbies")
+            self.call(guest, "POST", f"/lobbies/{lobby_id}/join", "/lobbies/<id>/join")
+        self.call(
+            host,
+            "GET",
+            f"/lobbies/{lobby_id}",
+            "/lobbies/<id>",
+            query={"users": "true"},
+        )
+        self.call(host, "POST", "/lobbies/start")
+
+        self.play_game(lobby_id, users)
+        for user in users:
+            self.call(user, "POST", "/lobbies/leave")
+        self.lobbies += 1
+
+    def play_game(self, game_id: str, users: List[BotUser]) -> None:
+        from core.controllers import GameController
+        from engine.simulation import tally
+
+        bots = {user.id: user.bot for user in users}
+        for _ in range(self.max_days):
+            with self.report.time("game night"):
+                game = GameController.get_game_by_id(game_id)
+                engine_game = GameController.load_engine_game(game)
+                # Each bot picks from its own actor's dump, as a client would
+                for actor, dump in zip(engine_game.actors, engine_game.dump_actors()):
+                    numbers = bots[actor.player.id].choose_targets(dump)
+                    actor.set_targets(
+                        [engine_game.get_actor_by_number(n) for n in numbers]
+                    )
+                changes = engine_game.resolve()
+                GameController.save_game_changes(game, engine_game, changes)
+                GameController.publish_game_changes(game_id, engine_game, changes)
+                winners = engine_game.check_for_win()
+            if winners:
+                break
+
+            with self.report.time("game lynch"):
+                state = engine_game.dump_state()
+                alive = engine_game.alive_actors
+                votes = {
+                    actor.number: bots[actor.player.id].choose_vote(
+                        actor.dump_state(), state
+                    )
+                    for actor in alive
+                }
+                number = tally(votes, len(alive))
+                if number is not None:
+                    changes = engine_game.lynch(number)
+                    GameController.save_game_changes(game, engine_game, changes)
+                    GameController.publish_game_changes(game_id, engine_game, changes)
+                    winners = engine_game.check_for_win()
+            if winners:
+                break
+        self.games += 1
+
+    def run(self, first: int, users: int, lobby_size: int) -> None:
+        bots = self.create_users(first, users)
+        lobbies = [bots[i : i + lobby_size] for i in range(0, users, lobby_size)]
+
+        def play(lobby: List[BotUser]) -> None:
+            try:
+                self.play_lobby(lobby)
+            except Exception as e:  # Reported, one bad lobby shouldn't stop the run
+                self.failures.append(repr(e))
+
+        with ThreadPoolExecutor(max_workers=len(lobbies) or 1) as pool:
+            list(pool.map(play, lobbies))
+
+
+def run_container(job: Tuple[int, int, int, int, int]) -> dict:
+    """Play :users bot users from user number :first in a fresh container"""
+    first, users, lobby_size, seed, max_days = job
+
+    # Stand-ins go in before the routers are imported
+    stack = install()
+    from engine.simulation import headless
+
+    driver = Driver(stack, seed=seed, max_days=max_days)
+    # The handlers print as they go, keep that out of the report
+    with headless(), open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        driver.run(first, users, lobby_size)
+
+    return {
+        "samples": driver.report.samples,
+        "errors": driver.report.errors,
+        "failures": driver.failures,
+        "lobbies": driver.lobbies,
+        "games": driver.games,
+        "iotMessages": stack.iot.messages,
+        "iotBytes": stack.iot.bytes,
+    }
+
+
+def run(
+    users: int = 1000,
+    lobby_size: int = 8,
+    containers: int = 4,
+    seed: int = 0,
+    max_days: int = 10,
+) -> dict:
+    from engine.utils import process_map
+
+    # Whole lobbies per container, so no lobby spans two sets of stand-ins
+    lobbies = -(-users // lobby_size)
+    per_container = -(-lobbies // containers) * lobby_size
+    jobs = [
+        (first, min(per_container, users - first), lobby_size, seed, max_days)
+        for first in range(0, users, per_container)
+    ]
+
+    start = time.perf_counter()
+    results = process_map(run_container, jobs, max_workers=containers)
+    elapsed = time.perf_counter() - start
+
+    report = LatencyReport()
+    for result in results:
+        report.merge(result["samples"], result["errors"])
+    failures = [failure for result in results for failure in result["failures"]]
+    return {
+        "users": users,
+        "containers": len(jobs),
+        "lobbies": sum(result["lobbies"] for result in results),
+        "games": sum(result["games"] for result in results),
+        "failed": len(failures),
+        "failures": failures[:10],
+        "iotMessages": sum(result["iotMessages"] for result in results),
+        "iotBytes": sum(result["iotBytes"] for result in results),
+        **report.dump(elapsed),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--lobby-size", type=int, default=8)
+    parser.add_argument("--containers", type=int, default=4)
+    parser.add_argument("--max-days", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = run(
+        users=args.users,
+        lobby_size=args.lobby_size,
+        containers=args.containers,
+        seed=args.seed,
+        max_days=args.max_days,
+    )
+    print(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+In-process stand-ins for the AWS services the REST routers and event handlers
+talk to, so the real routers and controllers can be driven without a stage.
+
+install() has to run before anything from core or functions is imported.
+It sets the environment those modules read at import time, then swaps
+the stand-ins into their module level clients:
+
+    DynamoDB     - LocalTable per table, LocalDynamoClient for transactions
+    EventBridge  - LocalEventBus, events are handed to the lobby event handlers
+                   once the request that published them has returned
+    IoT          - LocalIot, counts what would have been pushed to clients
+    Auth         - LocalAuth issues tokens, no keys or sessions involved
+
+Values written to a table go through boto3's (de)serializer like they would
+on the wire, so anything DynamoDB would reject fails here too.
+"""
+
+from __future__ import annotations
+
+import copy
+import importlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+ENVIRONMENT = {
+    "SST_STAGE": "loadgen",
+    "SST_APP": "mafia",
+    "AWS_REGION": "ap-southeast-2",
+    "AWS_DEFAULT_REGION": "ap-southeast-2",
+    "AWS_ACCESS_KEY_ID": "loadgen",
+    "AWS_SECRET_ACCESS_KEY": "loadgen",
+    "SST_EVENTBUS_EVENTBUSNAME_BUS": "loadgen-bus",
+    "SST_TABLE_TABLENAME_USERTABLE": "loadgen-users",
+    "SST_TABLE_TABLENAME_LOBBYTABLE": "loadgen-lobbies",
+    "SST_TABLE_TABLENAME_GAMETABLE": "loadgen-games",
+    "SST_TABLE_TABLENAME_SESSIONTABLE": "loadgen-sessions",
+}
+
+# Event detail type -> module with the handler subscribed to it
+EVENT_HANDLERS = {
+    "lobby.user_join": "functions.events.lobby.user_join",
+    "lobby.user_leave": "functions.events.lobby.user_leave",
+    "lobby.start": "functions.events.lobby.start",
+}
+
+_CONDITION = re.compile(r"begins_with\((#\w+),\s*(:\w+)\)|(#\w+)\s*=\s*(:\w+)")
+_CLAUSE = re.compile(r"\b(set|remove)\b(.*?)(?=\b(?:set|remove)\b|$)", re.I | re.S)
+
+
+def _wire(value):
+    """Round trip a value through DynamoDB's type system"""
+    from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+    return TypeDeserializer().deserialize(TypeSerializer().serialize(value))
+
+
+class LocalTable:
+    """The subset of a boto3 Table the controllers use, held in a dict"""
+
+    def __init__(self, name: str, key: Tuple[str, ...]) -> None:
+        self.name = name
+        self.key = key
+        self.items: Dict[tuple, dict] = {}
+        self.lock = threading.Lock()
+
+    def _key(self, item: dict) -> tuple:
+        return tuple(item[name] for name in self.key)
+
+    def get_item(self, Key: dict) -> dict:
+        with self.lock:
+            item = self.items.get(self._key(Key))
+        return {"Item": copy.deepcopy(item)} if item is not None else {}
+
+    def put_item(self, Item: dict) -> dict:
+        item = _wire(Item)
+        with self.lock:
+            self.items[self._key(item)] = item
+        return {}
+
+    def delete_item(self, Key: dict) -> dict:
+        with self.lock:
+            self.items.pop(self._key(Key), None)
+        return {}
+
+    def update_item(
+        self,
+        Key: dict,
+        UpdateExpression: str,
+        ExpressionAttributeNames: dict,
+        ExpressionAttributeValues: Optional[dict] = None,
+    ) -> dict:
+        values = _wire(ExpressionAttributeValues or {})
+        with self.lock:
+            item = self.items.setdefault(self._key(Key), dict(Key))
+            for action, body in _CLAUSE.findall(UpdateExpression):
+                for part in filter(None, (p.strip() for p in body.split(","))):
+                    path, _, value = part.partition("=")
+                    *parents, name = [
+                        ExpressionAttributeNames[p] for p in path.strip().split(".")
+                    ]
+                    target = item
+                    for parent in parents:
+                        target = target.setdefault(parent, {})
+                    if action.lower() == "set":
+                        target[name] = values[value.strip()]
+                    else:
+                        target.pop(name, None)
+        return {}
+
+    def query(
+        self,
+        KeyConditionExpression: str,
+        ExpressionAttributeNames: dict,
+        ExpressionAttributeValues: dict,
+        IndexName: Optional[str] = None,
+    ) -> dict:
+        # Only equality and begins_with joined by "and", which is all we use
+        conditions: List[Callable[[dict], bool]] = []
+        for prefix_name, prefix, name, value in _CONDITION.findall(
+            KeyConditionExpression
+        ):
+            if prefix_name:
+                attribute = ExpressionAttributeNames[prefix_name]
+                start = ExpressionAttributeValues[prefix]
+                conditions.append(
+                    lambda item, a=attribute, s=start: str(item.get(a, "")).startswith(
+                        s
+                    )
+                )
+            else:
+                attribute = ExpressionAttributeNames[name]
+                expected = ExpressionAttributeValues[value]
+                conditions.append(
+                    lambda item, a=attribute, e=expected: item.get(a) == e
+                )
+
+        with self.lock:
+            items = [
+                copy.deepcopy(item)
+                for item in self.items.values()
+                if all(condition(item) for condition in conditions)
+            ]
+        return {"Items": items}
+
+    def scan(self) -> dict:
+        with self.lock:
+            return {"Items": copy.deepcopy(list(self.items.values()))}
+
+    @contextmanager
+    def batch_writer(self) -> Iterator[LocalTable]:
+        yield self
+
+
+class TransactionCanceledException(Exception):
+    def __init__(self, reasons: List[dict]) -> None:
+        super().__init__("Transaction cancelled")
+        self.response = {"CancellationReasons": reasons}
+
+
+class LocalDynamoClient:
+    """transact_write_items over the LocalTables, applied under one lock"""
+
+    exceptions = SimpleNamespace(
+        TransactionCanceledException=TransactionCanceledException
+    )
+
+    def __init__(self, tables: Dict[str, LocalTable]) -> None:
+        self.tables = tables
+        self.lock = threading.Lock()
+
+    def transact_write_items(self, TransactItems: List[dict]) -> dict:
+        from boto3.dynamodb.types import TypeDeserializer
+
+        deserializer = TypeDeserializer()
+
+        def plain(values: dict) -> dict:
+            return {key: deserializer.deserialize(v) for key, v in values.items()}
+
+        with self.lock:
+            for operation in TransactItems:
+                ((kind, request),) = operation.items()
+                table = self.tables[request["TableName"]]
+                if kind == "Put":
+                    table.put_item(Item=plain(request["Item"]))
+                elif kind == "Delete":
+                    table.delete_item(Key=plain(request["Key"]))
+                elif kind == "Update":
+                    table.update_item(
+                        Key=plain(request["Key"]),
+                        UpdateExpression=request["UpdateExpression"],
+                        ExpressionAttributeNames=request["ExpressionAttributeNames"],
+                        ExpressionAttributeValues=plain(
+                            request.get("ExpressionAttributeValues", {})
+                        ),
+                    )
+                else:
+                    raise TransactionCanceledException([{"Code": kind}])
+        return {}
+
+
+class LocalEventBus:
+    """
+    Holds published events per thread until drain() runs their handlers.
+
+    Lambdas subscribed to the bus run after the publishing request has
+    returned, so deferring them keeps their cost out of the route's latency.
+    """
+
+    def __init__(self) -> None:
+        self.local = threading.local()
+        self.handlers: Dict[str, Callable] = {}
+        self.published = 0
+
+    def _pending(self) -> List[dict]:
+        if not hasattr(self.local, "pending"):
+            self.local.pending = []
+        return self.local.pending
+
+    def put_events(self, Entries: List[dict]) -> dict:
+        self._pending().extend(Entries)
+        self.published += len(Entries)
+        return {"FailedEntryCount": 0, "Entries": [{} for _ in Entries]}
+
+    def drain(self) -> List[Tuple[str, float, Optional[Exception]]]:
+        """
+        Run the handlers for this thread's pending events. Returns each event's
+        type, how long its handler took and what it raised, if anything
+        """
+        handled = []
+        pending = self._pending()
+        while pending:
+            entry = pending.pop(0)
+            detail_type = entry["DetailType"]
+            if detail_type not in self.handlers:
+                module = importlib.import_module(EVENT_HANDLERS[detail_type])
+                self.handlers[detail_type] = module.handler
+
+            event = {
+                "version": "0",
+                "id": f"loadgen-{self.published}",
+                "detail-type": detail_type,
+                "source": entry["Source"],
+                "account": "000000000000",
+                "time": "1970-01-01T00:00:00Z",
+                "region": os.environ["AWS_REGION"],
+                "resources": [],
+                "detail": json.loads(entry["Detail"]),
+            }
+            error = None
+            start = time.perf_counter()
+            try:
+                self.handlers[detail_type](event, None)
+            except Exception as e:  # A failed Lambda doesn't stop the others
+                error = e
+            handled.append((detail_type, time.perf_counter() - start, error))
+        return handled
+
+
+@dataclass
+class LocalIot:
+    """Counts the messages and bytes that would have been pushed to clients"""
+
+    messages: int = 0
+    bytes: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def publish(self, topic: str, qos: int, payload: str) -> dict:
+        with self.lock:
+            self.messages += 1
+            self.bytes += len(payload)
+        return {}
+
+
+class LocalAuth:
+    """Bearer tokens for bot users, validated without keys or sessions"""
+
+    def __init__(self) -> None:
+        self.claims: Dict[str, dict] = {}
+
+    def issue(self, user_id: str) -> str:
+        token = f"loadgen.{user_id}"
+        self.claims[token] = {"sub": user_id}
+        return token
+
+    def validate_token(self, token: str, token_type: str = "accessToken") -> dict:
+        return self.claims.get(token)
+
+
+@dataclass
+class LocalStack:
+    tables: Dict[str, LocalTable]
+    bus: LocalEventBus
+    iot: LocalIot
+    auth: LocalAuth
+
+
+def install() -> LocalStack:
+    """Point core and functions at fresh stand-ins"""
+    for name, value in ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    import core.controllers.auth_controller as auth_controller
+    import core.controllers.lobby_controller as lobby_controller
+    import core.events
+    import core.realtime
+    from core.tables import GameTable, LobbyTable, SessionTable, UserTable
+
+    stack = LocalStack(
+        tables={
+            UserTable.table_name: LocalTable(UserTable.table_name, ("PK", "SK")),
+            LobbyTable.table_name: LocalTable(LobbyTable.table_name, ("PK", "SK")),
+            GameTable.table_name: LocalTable(GameTable.table_name, ("PK", "SK")),
+            SessionTable.table_name: LocalTable(SessionTable.table_name, ("userId",)),
+        },
+        bus=LocalEventBus(),
+        iot=LocalIot(),
+        auth=LocalAuth(),
+    )
+
+    for module in (UserTable, LobbyTable, GameTable, SessionTable):
+        module.table = stack.tables[module.table_name]
+    lobby_controller.ddb_client = LocalDynamoClient(stack.tables)
+    core.events.eb = stack.bus
+    core.realtime.boto3 = SimpleNamespace(client=lambda *args, **kwargs: stack.iot)
+    auth_controller.validate_token = stack.auth.validate_token
+
+    return stack
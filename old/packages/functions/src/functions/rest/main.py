@@ -1,17 +1,16 @@
 import json
-import os
 
-# This is because Python was created by people with brain rot
-if os.getenv("PYTEST"):
+# SST loads this file as a top level module next to the routers, anything
+# else (tests, the loadgen) imports it as part of the functions package
+if __package__:
     from . import (
         auth,
         authorizer,
         chat,
         lobbies,
         users,
-    )  # When Python is running "normally"
+    )
 else:
-    # When Python is being invoked via SST
     import auth
     import authorizer
     import chat
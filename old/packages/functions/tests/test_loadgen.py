@@ -0,0 +1,13 @@
+import logging
+
+from functions.loadgen import driver
+
+
+def test_loadgen_smoke():
+    logging.info("--- TEST: Loadgen smoke ---")
+    result = driver.run(users=16, containers=1)
+
+    assert result["failed"] == 0, result["failures"]
+    assert result["lobbies"] == 2
+    assert result["games"] == 2
+    assert result["iotMessages"] > 0